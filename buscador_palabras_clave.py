@@ -15,212 +15,2157 @@ import os
 import re
 import json
 import sys
+import math
+import time
+import argparse
+import csv
+import hashlib
+import mmap
+import random
+import sqlite3
+import zlib
+from bisect import bisect_left
 from collections import Counter
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+# Motores de búsqueda opcionales (se usan solo si están instalados)
+try:
+    import regex
+except ImportError:
+    regex = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 # ==========================================================================
 # ⚙️ CONFIGURACIÓN - MODIFICA AQUÍ TU PALABRA CLAVE
 # ==========================================================================
 
-# INSTRUCCIONES:
-# 1. Reemplaza "ejemplo" con la palabra EXACTA que quieras buscar
-# 2. El script buscará esa palabra en cualquier combinación de mayúsculas/minúsculas
-#    Ejemplo: "Falla" encontrará "Falla", "falla", "FALLA", pero NO "fallará"
-# 3. Solo se permite UNA palabra clave a la vez
+# INSTRUCCIONES:
+# 1. Reemplaza "ejemplo" con la palabra EXACTA que quieras buscar
+# 2. El script buscará esa palabra en cualquier combinación de mayúsculas/minúsculas
+#    Ejemplo: "Falla" encontrará "Falla", "falla", "FALLA", pero NO "fallará"
+# 3. Solo se permite UNA palabra clave a la vez
+
+PALABRA_CLAVE = "Ejemplo"  # ← Cambia esto por tu palabra clave
+
+# MOTOR DE BÚSQUEDA (normalmente no hace falta cambiarlo):
+# "auto" mide los motores disponibles con una muestra del corpus y elige el más rápido.
+# Otros valores: "re" (expresión regular estándar), "cadena" (búsqueda de texto simple),
+# "regex" (requiere pip install regex), "automata" (requiere pip install pyahocorasick)
+MOTOR_BUSQUEDA = "auto"
+
+# ERRORES DE OCR (OPCIONAL): encontrar también variantes mal reconocidas
+# Número máximo de letras cambiadas, añadidas, borradas o intercambiadas:
+#   0 = solo la palabra exacta, 1 = "Falla" encuentra "Fal1a", "Failla", "Fala"...
+#   2 = más variantes (con palabras cortas puede encontrar otras palabras reales)
+DISTANCIA_MAXIMA_OCR = 0
+# Archivo donde se guarda el vocabulario del corpus para no recalcularlo
+ARCHIVO_INDICE_VOCABULARIO = 'indice_vocabulario.json'
+
+# ARCHIVOS MUY GRANDES: los archivos de al menos este tamaño (en MB) se dividen
+# en trozos que se analizan a la vez en varios núcleos. None = desactivado
+TAMAÑO_MINIMO_PARALELO_MB = 256
+# Número de procesos para analizar un archivo grande (None = todos los núcleos)
+PROCESOS_PARALELOS = None
+
+# COLOCACIONES (OPCIONAL):
+# Número de palabras a cada lado de la palabra clave que se consideran
+# "palabras cercanas". Con 0 el análisis de colocaciones está desactivado.
+# Ejemplo: 5 analiza las 5 palabras anteriores y las 5 posteriores.
+VENTANA_COLOCACIONES = 0
+
+# Máximo de palabras distintas que se guardan en memoria para las
+# estadísticas de colocaciones (las menos frecuentes se descartan al llenarse)
+LIMITE_VOCABULARIO_COLOCACIONES = 200000
+
+# MODO VIGILANCIA (python3 buscador_palabras_clave.py /ruta --vigilar):
+# Cada cuántos segundos se comprueba si hay archivos nuevos, modificados o borrados
+INTERVALO_SONDEO = 2.0
+# Cada cuántos segundos, como mínimo, se reescriben el JSON y el HTML tras un cambio
+INTERVALO_ESCRITURA = 10.0
+
+# SUBCORPUS (OPCIONAL): resultados separados por grupo en el mismo análisis
+# Niveles de carpeta que definen grupos. Con revista/año/ejemplar.txt:
+#   [1] agrupa por revista, [2] por año, [1, 2] por ambos
+AGRUPAR_POR_NIVELES = []
+# Expresiones regulares sobre la ruta: {"nombre del criterio": r"patrón"}
+# El grupo es el primer paréntesis del patrón (o la coincidencia completa)
+# Ejemplo: {"año": r"(1[89]\d\d)"} agrupa por el año que aparezca en la ruta
+AGRUPAR_POR_PATRONES = {}
+# CSV de metadatos con una columna "archivo" (nombre o ruta relativa) y
+# una columna por criterio (ej.: archivo,revista,ciudad). None = sin CSV
+ARCHIVO_METADATOS_CSV = None
+
+# DUPLICADOS (OPCIONAL): omitir archivos repetidos (p. ej. revistas re-escaneadas)
+# True = los archivos con contenido idéntico solo se cuentan una vez
+DEDUPLICAR = False
+# True = además detecta casi-duplicados (mismo texto con pequeñas diferencias de OCR)
+DETECTAR_CASI_DUPLICADOS = False
+# Parecido mínimo (0-1) para considerar dos archivos casi-duplicados
+UMBRAL_CASI_DUPLICADOS = 0.9
+# Archivo donde se guardan las huellas para no recalcularlas en la siguiente ejecución
+ARCHIVO_CACHE_HUELLAS = 'huellas_archivos.json'
+
+# HISTÓRICO DE BÚSQUEDAS (OPCIONAL): base de datos SQLite donde se guarda cada
+# ejecución para compararlas después sin volver a analizar el corpus.
+# Ejemplo: 'historico_busquedas.db'. None = no se guarda
+BASE_DATOS_RESULTADOS = None
+
+
+# ==========================================================================
+# CONTADOR CON MEMORIA LIMITADA
+# ==========================================================================
+
+class ContadorAcotado:
+    def __init__(self, capacidad):
+        """
+        Contador de frecuencias que nunca guarda más de `capacidad` claves
+
+        Cuando se llena, descarta las claves menos frecuentes (poda). El
+        umbral de cada poda se suma en `error_maximo`: cualquier clave que ya
+        no está en el contador aparecía como mucho `error_maximo` veces.
+
+        Args:
+            capacidad (int): Número máximo de claves distintas
+        """
+        self.capacidad = max(2, capacidad)
+        self.conteos = Counter()
+        self.error_maximo = 0
+        self.podas = 0
+
+    def actualizar(self, claves):
+        """
+        Suma una aparición por cada clave del iterable
+
+        Se suma por lotes de `capacidad` claves y se poda entre lotes, de modo
+        que el contador no supera 2 × capacidad aunque el iterable sea enorme.
+        """
+        claves = iter(claves)
+        while True:
+            lote = list(islice(claves, self.capacidad))
+            if not lote:
+                break
+            self.conteos.update(lote)
+            if len(self.conteos) > self.capacidad:
+                self._podar()
+
+    def _podar(self):
+        # Conservar la mitad más frecuente de la capacidad
+        conservar = self.capacidad // 2
+        ordenados = self.conteos.most_common()
+        umbral = ordenados[conservar][1]
+        self.conteos = Counter(dict(ordenados[:conservar]))
+        self.error_maximo += umbral
+        self.podas += 1
+
+    def frecuencia(self, clave):
+        """Frecuencia conocida de la clave, o el máximo posible si se podó"""
+        if clave in self.conteos:
+            return self.conteos[clave]
+        return self.error_maximo
+
+    def restar(self, conteos):
+        """Descuenta conteos previamente sumados (las claves a cero se eliminan)"""
+        for clave, n in conteos.items():
+            restante = self.conteos.get(clave, 0) - n
+            if restante > 0:
+                self.conteos[clave] = restante
+            else:
+                self.conteos.pop(clave, None)
+
+    def most_common(self, n=None):
+        return self.conteos.most_common(n)
+
+
+# ==========================================================================
+# RESUMEN INCREMENTAL
+# ==========================================================================
+
+class AcumuladorResumen:
+    def __init__(self):
+        """
+        Acumula las estadísticas generales archivo a archivo
+
+        Permite consultar el resumen en cualquier momento del análisis sin
+        recorrer de nuevo la lista de resultados.
+        """
+        self.total_archivos = 0
+        self.total_palabras = 0
+        self.total_menciones = 0
+        self.archivos_con_palabra = 0
+        self.archivos_sin_palabra = 0
+
+    def agregar(self, resultado):
+        """Suma el resultado de un archivo a los totales"""
+        self.total_archivos += 1
+        self.total_palabras += resultado['palabras']
+        self.total_menciones += resultado['total_menciones']
+        if resultado['tiene_palabra_clave']:
+            self.archivos_con_palabra += 1
+        else:
+            self.archivos_sin_palabra += 1
+
+    def quitar(self, resultado):
+        """Descuenta un resultado sumado antes (archivo modificado o eliminado)"""
+        self.total_archivos -= 1
+        self.total_palabras -= resultado['palabras']
+        self.total_menciones -= resultado['total_menciones']
+        if resultado['tiene_palabra_clave']:
+            self.archivos_con_palabra -= 1
+        else:
+            self.archivos_sin_palabra -= 1
+
+    def resumen_general(self):
+        """
+        Calcula porcentajes y frecuencia relativa con los totales actuales
+
+        Returns:
+            dict: Misma estructura que resultados['resumen_general']
+        """
+        # Calcular porcentajes
+        porcentaje_con_palabra = round(
+            (self.archivos_con_palabra / self.total_archivos * 100)
+            if self.total_archivos > 0 else 0, 2
+        )
+
+        porcentaje_sin_palabra = round(
+            (self.archivos_sin_palabra / self.total_archivos * 100)
+            if self.total_archivos > 0 else 0, 2
+        )
+
+        # Frecuencia relativa (menciones por millón de palabras)
+        frecuencia_por_millon = round(
+            (self.total_menciones / self.total_palabras * 1000000)
+            if self.total_palabras > 0 else 0, 2
+        )
+
+        return {
+            'total_menciones': self.total_menciones,
+            'archivos_con_palabra': self.archivos_con_palabra,
+            'archivos_sin_palabra': self.archivos_sin_palabra,
+            'porcentaje_con_palabra': porcentaje_con_palabra,
+            'porcentaje_sin_palabra': porcentaje_sin_palabra,
+            'frecuencia_por_millon_palabras': frecuencia_por_millon
+        }
+
+
+# ==========================================================================
+# AGRUPACIÓN EN SUBCORPUS
+# ==========================================================================
+
+class AgrupadorArchivos:
+    def __init__(self, niveles=None, patrones=None, archivo_csv=None):
+        """
+        Asigna cada archivo a uno o varios grupos (criterio → valor)
+
+        Args:
+            niveles (list): Niveles de carpeta (1 = primera subcarpeta) usados como criterio
+            patrones (dict): {criterio: expresión regular aplicada a la ruta relativa}
+            archivo_csv (str): CSV con columna "archivo" y una columna por criterio
+        """
+        self.niveles = list(niveles or [])
+        self.patrones = {nombre: re.compile(patron) for nombre, patron in (patrones or {}).items()}
+        self.metadatos = {}
+        if archivo_csv:
+            with open(archivo_csv, 'r', encoding='utf-8-sig', newline='') as f:
+                for fila in csv.DictReader(f):
+                    clave = os.path.normpath(fila.pop('archivo', '').strip())
+                    self.metadatos[clave] = {k: v.strip() for k, v in fila.items() if k and v and v.strip()}
+
+    def __bool__(self):
+        return bool(self.niveles or self.patrones or self.metadatos)
+
+    def grupos(self, ruta, directorio):
+        """
+        Calcula los grupos de un archivo
+
+        Args:
+            ruta (str): Ruta del archivo
+            directorio (str): Directorio raíz del análisis
+
+        Returns:
+            dict: {criterio: valor}, solo con los criterios que aplican al archivo
+        """
+        relativa = os.path.relpath(ruta, directorio)
+        carpetas = relativa.split(os.sep)[:-1]
+        grupos = {}
+
+        for nivel in self.niveles:
+            if 0 < nivel <= len(carpetas):
+                grupos[f"nivel {nivel}"] = carpetas[nivel - 1]
+
+        for nombre, patron in self.patrones.items():
+            m = patron.search(relativa.replace(os.sep, '/'))
+            if m:
+                grupos[nombre] = m.group(1) if patron.groups else m.group(0)
+
+        if self.metadatos:
+            fila = self.metadatos.get(os.path.normpath(relativa)) \
+                or self.metadatos.get(os.path.basename(ruta))
+            if fila:
+                grupos.update(fila)
+
+        return grupos
+
+
+# ==========================================================================
+# DETECCIÓN DE DUPLICADOS
+# ==========================================================================
+
+class DetectorDuplicados:
+    # MinHash: número de funciones hash y bandas para la búsqueda de candidatos (LSH)
+    num_permutaciones = 32
+    num_bandas = 8
+    palabras_por_fragmento = 5
+
+    def __init__(self, casi_duplicados=False, umbral=UMBRAL_CASI_DUPLICADOS, archivo_cache=None):
+        """
+        Detecta archivos duplicados antes de buscar la palabra clave
+
+        Los duplicados exactos se reconocen por un hash del contenido (BLAKE2b).
+        Los casi-duplicados, por firmas MinHash de fragmentos de 5 palabras,
+        comparando solo los candidatos que comparten alguna banda (LSH).
+        Las huellas se guardan en `archivo_cache` junto con la fecha y tamaño
+        de cada archivo: si no ha cambiado, no hace falta volver a leerlo.
+
+        Args:
+            casi_duplicados (bool): Detectar también casi-duplicados
+            umbral (float): Similitud mínima (0-1) para un casi-duplicado
+            archivo_cache (str): JSON donde persistir las huellas (None = sin caché)
+        """
+        self.casi_duplicados = casi_duplicados
+        self.umbral = umbral
+        self.archivo_cache = archivo_cache
+        generador = random.Random(20250101)
+        self._mascaras = [generador.getrandbits(32) for _ in range(self.num_permutaciones)]
+        self.cache = {}
+        if archivo_cache and os.path.exists(archivo_cache):
+            try:
+                with open(archivo_cache, 'r', encoding='utf-8') as f:
+                    self.cache = json.load(f)
+            except (OSError, ValueError):
+                self.cache = {}
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Olvida los archivos vistos (la caché de huellas se conserva)"""
+        self._originales = {}
+        self._bandas = {}
+        self._huellas_por_ruta = {}
+
+    def firma_minhash(self, texto):
+        """
+        Calcula la firma MinHash de un texto
+
+        Args:
+            texto (str): Contenido del archivo
+
+        Returns:
+            list: num_permutaciones enteros de 32 bits
+        """
+        palabras = texto.lower().split()
+        n = self.palabras_por_fragmento
+        fragmentos = {
+            zlib.crc32(' '.join(palabras[i:i + n]).encode('utf-8'))
+            for i in range(max(1, len(palabras) - n + 1))
+        }
+        return [min(map(mascara.__xor__, fragmentos)) for mascara in self._mascaras]
+
+    def firma_minhash_archivo(self, ruta, tamaño_bloque=1 << 20):
+        """
+        Misma firma que firma_minhash, leyendo el archivo por bloques
+
+        Para archivos muy grandes: la memoria depende del bloque, no del archivo.
+
+        Args:
+            ruta (str): Ruta del archivo
+            tamaño_bloque (int): Caracteres leídos en cada bloque
+
+        Returns:
+            list: num_permutaciones enteros de 32 bits
+        """
+        n = self.palabras_por_fragmento
+        minimos = [None] * self.num_permutaciones
+        previas = []     # Últimas n-1 palabras del bloque anterior
+        cortada = ''     # Palabra partida al final del bloque anterior
+        total = 0
+        with open(ruta, 'r', encoding='utf-8', errors='ignore') as f:
+            while True:
+                bloque = f.read(tamaño_bloque)
+                texto = cortada + bloque
+                nuevas = texto.split()
+                cortada = ''
+                if bloque and nuevas and not texto[-1].isspace():
+                    cortada = nuevas.pop()
+                # Cada palabra por separado da el mismo resultado que texto.lower().split()
+                palabras = previas + [p.lower() for p in nuevas]
+                total += len(nuevas)
+                fragmentos = {
+                    zlib.crc32(' '.join(palabras[i:i + n]).encode('utf-8'))
+                    for i in range(len(palabras) - n + 1)
+                }
+                if not bloque and total < n:
+                    # Archivo con menos de n palabras: un único fragmento
+                    fragmentos = {zlib.crc32(' '.join(palabras).encode('utf-8'))}
+                if fragmentos:
+                    for j, mascara in enumerate(self._mascaras):
+                        minimo = min(map(mascara.__xor__, fragmentos))
+                        if minimos[j] is None or minimo < minimos[j]:
+                            minimos[j] = minimo
+                previas = palabras[-(n - 1):] if n > 1 else []
+                if not bloque:
+                    return minimos
+
+    def _claves_bandas(self, firma):
+        filas = self.num_permutaciones // self.num_bandas
+        return [(b, tuple(firma[b * filas:(b + 1) * filas])) for b in range(self.num_bandas)]
+
+    def comprobar(self, ruta, leer_contenido=True):
+        """
+        Comprueba si un archivo duplica a otro ya visto y lo registra si no
+
+        Args:
+            ruta (str): Ruta del archivo
+            leer_contenido (bool): Si es False, el archivo se recorre por
+                bloques sin cargarlo entero y no se devuelve su contenido
+                (archivos que se analizarán en paralelo)
+
+        Returns:
+            tuple: (duplicado, contenido). `duplicado` es None o un dict con
+                duplicado_de, tipo ('exacto' o 'casi') y similitud. `contenido`
+                es el texto decodificado si hubo que leer el archivo, o None.
+        """
+        info = os.stat(ruta)
+        clave_cache = os.path.abspath(ruta)
+        guardado = self.cache.get(clave_cache)
+        if guardado and (guardado['mtime_ns'], guardado['tamaño']) != (info.st_mtime_ns, info.st_size):
+            guardado = None
+
+        contenido = None
+        if guardado:
+            huella = guardado['hash']
+            firma = guardado.get('minhash')
+        elif leer_contenido:
+            with open(ruta, 'rb') as f:
+                datos = f.read()
+            huella = hashlib.blake2b(datos, digest_size=16).hexdigest()
+            firma = None
+            # Misma decodificación que open(..., errors='ignore') en modo texto
+            contenido = datos.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+        else:
+            h = hashlib.blake2b(digest_size=16)
+            with open(ruta, 'rb') as f:
+                for bloque in iter(lambda: f.read(1 << 20), b''):
+                    h.update(bloque)
+            huella = h.hexdigest()
+            firma = None
+
+        if huella in self._originales:
+            return {'duplicado_de': self._originales[huella], 'tipo': 'exacto', 'similitud': 1.0}, contenido
+
+        bandas = []
+        if self.casi_duplicados:
+            if firma is None:
+                if not leer_contenido:
+                    firma = self.firma_minhash_archivo(ruta)
+                else:
+                    if contenido is None:
+                        with open(ruta, 'r', encoding='utf-8', errors='ignore') as f:
+                            contenido = f.read()
+                    firma = self.firma_minhash(contenido)
+            bandas = self._claves_bandas(firma)
+
+            candidatos = {self._bandas[b] for b in bandas if b in self._bandas}
+            mejor, similitud = None, 0.0
+            for candidato in candidatos:
+                otra = self._huellas_por_ruta[candidato][1]
+                parecido = sum(a == b for a, b in zip(firma, otra)) / len(firma)
+                if parecido > similitud:
+                    mejor, similitud = candidato, parecido
+            if mejor is not None and similitud >= self.umbral:
+                self._actualizar_cache(clave_cache, info, huella, firma)
+                return {'duplicado_de': mejor, 'tipo': 'casi', 'similitud': round(similitud, 3)}, contenido
+
+        # Archivo original: registrarlo
+        self._originales[huella] = ruta
+        for b in bandas:
+            self._bandas.setdefault(b, ruta)
+        self._huellas_por_ruta[ruta] = (huella, firma, bandas)
+        self._actualizar_cache(clave_cache, info, huella, firma)
+        return None, contenido
+
+    def olvidar(self, ruta):
+        """Deja de considerar un archivo como original (modificado o eliminado)"""
+        registro = self._huellas_por_ruta.pop(ruta, None)
+        if registro is None:
+            return
+        huella, firma, bandas = registro
+        if self._originales.get(huella) == ruta:
+            del self._originales[huella]
+        for b in bandas:
+            if self._bandas.get(b) == ruta:
+                del self._bandas[b]
+
+    def _actualizar_cache(self, clave, info, huella, firma):
+        if not self.archivo_cache:
+            return
+        entrada = {'mtime_ns': info.st_mtime_ns, 'tamaño': info.st_size, 'hash': huella}
+        if firma is not None:
+            entrada['minhash'] = firma
+        self.cache[clave] = entrada
+
+    def guardar_cache(self):
+        """Escribe la caché de huellas en disco"""
+        if self.archivo_cache:
+            with open(self.archivo_cache, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False)
+
+
+# ==========================================================================
+# MOTORES DE BÚSQUEDA
+# ==========================================================================
+
+def _es_caracter_palabra(c):
+    """Equivalente a \\w de re para textos Unicode"""
+    return c.isalnum() or c == '_'
+
+
+def _es_limite(texto, posicion):
+    """Equivalente a \\b de re: cambia el tipo de carácter (palabra / no palabra)"""
+    antes = posicion > 0 and _es_caracter_palabra(texto[posicion - 1])
+    despues = posicion < len(texto) and _es_caracter_palabra(texto[posicion])
+    return antes != despues
+
+
+def _seleccionar_no_solapadas(apariciones):
+    """
+    Reproduce el orden de re.finditer a partir de apariciones posiblemente solapadas
+
+    De izquierda a derecha, toma la más larga en cada posición y salta las
+    que se solapan con la anterior.
+    """
+    seleccion = []
+    fin_anterior = 0
+    for inicio, fin in sorted(apariciones, key=lambda a: (a[0], a[0] - a[1])):
+        if inicio >= fin_anterior:
+            seleccion.append((inicio, fin))
+            fin_anterior = fin
+    return seleccion
+
+
+class MotorBusqueda:
+    """
+    Interfaz común de los motores de búsqueda
+
+    Todos encuentran los términos como palabras completas (\\b...\\b) sin
+    distinguir mayúsculas y devuelven las mismas posiciones que re.finditer.
+    """
+    nombre = ''
+
+    def __init__(self, terminos):
+        """
+        Args:
+            terminos (list): Palabras o expresiones a buscar
+        """
+        self.terminos = list(terminos)
+
+    @staticmethod
+    def disponible():
+        return True
+
+    def buscar(self, contenido):
+        """
+        Args:
+            contenido (str): Texto a analizar
+
+        Returns:
+            list: (inicio, fin) de cada aparición, en orden
+        """
+        raise NotImplementedError
+
+
+class MotorRe(MotorBusqueda):
+    nombre = 're'
+
+    def __init__(self, terminos):
+        super().__init__(terminos)
+        # Crear patrón regex para la palabra exacta (case-insensitive)
+        # \b = límite de palabra (busca palabras completas, no dentro de otras)
+        # re.IGNORECASE = busca en cualquier combinación de mayúsculas/minúsculas
+        alternativas = '|'.join(re.escape(t) for t in sorted(self.terminos, key=len, reverse=True))
+        self.patron = re.compile(r'\b(?:' + alternativas + r')\b', re.IGNORECASE)
+
+    def buscar(self, contenido):
+        return [m.span() for m in self.patron.finditer(contenido)]
+
+
+class MotorRegex(MotorRe):
+    nombre = 'regex'
+
+    # \w del módulo regex incluye marcas combinantes (categoría Mn) y el de re no:
+    # el límite de palabra se escribe a mano con la misma clase que usa re
+    # (str.isalnum() o '_')
+    _PALABRA = r'[\p{L}\p{N}_]'
+    _LIMITE = rf'(?:(?<={_PALABRA})(?!{_PALABRA})|(?<!{_PALABRA})(?={_PALABRA}))'
+
+    def __init__(self, terminos):
+        MotorBusqueda.__init__(self, terminos)
+        alternativas = '|'.join(regex.escape(t) for t in sorted(self.terminos, key=len, reverse=True))
+        self.patron = regex.compile(self._LIMITE + r'(?:' + alternativas + r')' + self._LIMITE,
+                                    regex.IGNORECASE | regex.V0)
+        # regex no iguala 'ı' (i sin punto) con 'i' y re sí: esos textos se buscan con re
+        self._respaldo = MotorRe(terminos) if any(c in t.lower() for t in self.terminos for c in 'iı') else None
+
+    def buscar(self, contenido):
+        if self._respaldo is not None and 'ı' in contenido:
+            return self._respaldo.buscar(contenido)
+        return super().buscar(contenido)
+
+    @staticmethod
+    def disponible():
+        return regex is not None
+
+
+_PLIEGUE = None
+
+
+def _pliegue_minusculas():
+    """
+    Caracteres en minúscula cuyas equivalencias de re.IGNORECASE no resuelve lower()
+
+    re considera iguales 'ſ' y 's', 'ı' e 'i' o 'ς' y 'σ', pero lower() las
+    deja distintas. Se calcula una vez recorriendo el plano básico de Unicode.
+
+    Returns:
+        tuple: ({carácter: forma canónica}, patrón que encuentra cualquiera de
+            esos caracteres o de los que tienen mayúscula de varias letras)
+    """
+    global _PLIEGUE
+    if _PLIEGUE is None:
+        canonicos = {}
+        conflictivos = set()
+        for cp in range(0x10000):
+            letra = chr(cp).lower()
+            if len(letra) != 1:
+                continue
+            mayuscula = letra.upper()
+            if len(mayuscula) != 1:
+                conflictivos.add(letra)
+            elif mayuscula.lower() != letra:
+                conflictivos.add(letra)
+                canonicos[letra] = mayuscula.lower()
+        patron = re.compile('[' + ''.join(re.escape(c) for c in sorted(conflictivos)) + ']')
+        _PLIEGUE = (canonicos, patron)
+    return _PLIEGUE
+
+
+class _MotorMinusculas(MotorBusqueda):
+    """Base de los motores que buscan sobre el texto en minúsculas"""
+
+    def __init__(self, terminos):
+        super().__init__(terminos)
+        canonicos, self._conflictivos = _pliegue_minusculas()
+        tabla = str.maketrans(canonicos)
+        self.terminos_minusculas = [t.lower().translate(tabla) for t in self.terminos]
+        # Un término con caracteres sin forma canónica solo se busca con re
+        self._solo_respaldo = any(self._conflictivos.search(t) for t in self.terminos_minusculas)
+        self._respaldo = MotorRe(terminos)
+
+    def buscar(self, contenido):
+        texto = contenido.lower()
+        # Algunos caracteres cambian de longitud al pasar a minúsculas ('İ') y
+        # otros son equivalentes para re sin serlo para lower() ('ſ' y 's'): en
+        # esos casos los resultados no coincidirían, así que se usa re
+        if (self._solo_respaldo or len(texto) != len(contenido)
+                or self._conflictivos.search(texto)):
+            return self._respaldo.buscar(contenido)
+        validas = [(inicio, fin) for inicio, fin in self._apariciones(texto)
+                   if _es_limite(contenido, inicio) and _es_limite(contenido, fin)]
+        return _seleccionar_no_solapadas(validas)
+
+    def _apariciones(self, texto):
+        raise NotImplementedError
+
+
+class MotorCadena(_MotorMinusculas):
+    nombre = 'cadena'
+
+    def _apariciones(self, texto):
+        for termino in self.terminos_minusculas:
+            if not termino:
+                continue
+            longitud = len(termino)
+            inicio = texto.find(termino)
+            while inicio != -1:
+                yield inicio, inicio + longitud
+                inicio = texto.find(termino, inicio + 1)
+
+
+class MotorAutomata(_MotorMinusculas):
+    nombre = 'automata'
+
+    def __init__(self, terminos):
+        super().__init__(terminos)
+        self.automata = ahocorasick.Automaton()
+        for termino in self.terminos_minusculas:
+            if termino:
+                self.automata.add_word(termino, len(termino))
+        self.automata.make_automaton()
+
+    @staticmethod
+    def disponible():
+        return ahocorasick is not None
+
+    def _apariciones(self, texto):
+        if not len(self.automata):
+            return
+        for final, longitud in self.automata.iter(texto):
+            yield final - longitud + 1, final + 1
+
+
+MOTORES = {motor.nombre: motor for motor in (MotorRe, MotorCadena, MotorRegex, MotorAutomata)}
+
+# Textos con casos difíciles que todo motor debe resolver igual que 're'
+CASOS_PRUEBA_MOTORES = [
+    "{t} al principio y al final {t}",
+    "{T}, {t}. ({t}) «{t}» -{t}- {t}_no {t}2 x{t} {t}{t}",
+    "MAYÚSCULAS {T_MAY} y mezcla {T_MIX}",
+    "Sin saltos{t}\n{t}\tcon\r\nespacios  {t}  ",
+    "Acentos: á{t} {t}é ñ{t} {t}ü İstanbul {t}",
+    "Grafías antiguas: {T_ANT} {t} Caſa ıglesia",
+    "Sigma final: {T_SIG} {t} λόγος σοφός",
+    "Marcas combinantes: {t}\u0301 {t}\u0308x \u0301{t} {t}",
+]
+
+
+def casos_prueba_motores(termino):
+    """Genera los textos de CASOS_PRUEBA_MOTORES para un término concreto"""
+    mezcla = ''.join(c.upper() if i % 2 else c.lower() for i, c in enumerate(termino))
+    # Variantes que re.IGNORECASE iguala y lower() no: s larga, i sin punto, sigma final
+    antigua = termino.replace('s', 'ſ').replace('i', 'ı')
+    sigma = termino.replace('σ', 'ς').replace('Σ', 'ς')
+    return [caso.format(t=termino, T=termino.capitalize(), T_MAY=termino.upper(), T_MIX=mezcla,
+                        T_ANT=antigua, T_SIG=sigma)
+            for caso in CASOS_PRUEBA_MOTORES]
+
+
+def calibrar_motores(terminos, muestras, nombres=None):
+    """
+    Comprueba y cronometra los motores disponibles con textos de muestra
+
+    Un motor que no devuelve exactamente las mismas posiciones que 're' en
+    los casos de prueba o en las muestras queda descartado.
+
+    Args:
+        terminos (list): Términos de búsqueda
+        muestras (list): Textos de muestra del corpus
+        nombres (list): Motores a probar (todos los disponibles si None)
+
+    Returns:
+        tuple: (nombre del motor más rápido, {nombre: segundos o None si falló})
+    """
+    textos = list(muestras)
+    for termino in terminos:
+        textos.extend(casos_prueba_motores(termino))
+
+    referencia_motor = MotorRe(terminos)
+    referencia = [referencia_motor.buscar(t) for t in textos]
+
+    tiempos = {}
+    for nombre in (nombres or MOTORES):
+        clase = MOTORES[nombre]
+        if not clase.disponible():
+            continue
+        motor = clase(terminos)
+        inicio = time.perf_counter()
+        obtenido = [motor.buscar(t) for t in textos]
+        segundos = time.perf_counter() - inicio
+        tiempos[nombre] = segundos if obtenido == referencia else None
+
+    validos = {n: t for n, t in tiempos.items() if t is not None}
+    return min(validos, key=validos.get), tiempos
+
+
+# ==========================================================================
+# VARIANTES OCR (BÚSQUEDA APROXIMADA)
+# ==========================================================================
+
+def distancia_edicion(a, b, maximo):
+    """
+    Distancia de Damerau-Levenshtein (transposiciones adyacentes) con corte
+
+    Args:
+        a, b (str): Palabras a comparar
+        maximo (int): Si la distancia supera este valor se devuelve maximo + 1
+
+    Returns:
+        int: Número mínimo de ediciones
+    """
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    anterior2 = None
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        actual = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            coste = 0 if a[i - 1] == b[j - 1] else 1
+            actual[j] = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + coste)
+            if (anterior2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                actual[j] = min(actual[j], anterior2[j - 2] + 1)
+        if min(actual) > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, actual
+    return anterior[-1]
+
+
+class IndiceVocabulario:
+    def __init__(self, distancia_maxima=1):
+        """
+        Vocabulario del corpus con índice de borrados (SymSpell)
+
+        Cada palabra del vocabulario se indexa por todas las formas que
+        resultan de borrarle hasta `distancia_maxima` letras. Para encontrar
+        las variantes de un término basta con generar sus propios borrados y
+        consultarlos en el índice: el coste depende del tamaño del
+        vocabulario, no del texto del corpus.
+
+        El índice se construye por longitudes de palabra, solo para las que
+        piden las consultas, y se amplía al añadir palabras. El vocabulario
+        solo crece: las palabras de archivos modificados o eliminados no se
+        restan, lo que como mucho añade variantes que luego no aparecen.
+        De cada archivo se guarda solo su fecha y tamaño, para volver a leer
+        únicamente los nuevos o modificados.
+
+        Args:
+            distancia_maxima (int): Distancia de edición máxima de las variantes
+        """
+        self.distancia_maxima = distancia_maxima
+        self.vocabulario = Counter()
+        # {ruta: (mtime_ns, tamaño)} de los archivos ya leídos
+        self.archivos = {}
+        # {longitud de palabra: {borrado: [palabras]}}
+        self._borrados = {}
+
+    @staticmethod
+    def firma_archivo(ruta):
+        """(mtime_ns, tamaño) del archivo, o None si no se puede consultar"""
+        try:
+            info = os.stat(ruta)
+        except OSError:
+            return None
+        return (info.st_mtime_ns, info.st_size)
+
+    def agregar(self, ruta):
+        """
+        Lee un archivo y añade sus palabras al vocabulario y al índice
+
+        Returns:
+            bool: True si se pudo leer
+        """
+        firma = self.firma_archivo(ruta)
+        try:
+            with open(ruta, 'r', encoding='utf-8', errors='ignore') as f:
+                palabras = Counter(re.findall(r'\w+', f.read().lower()))
+        except OSError:
+            return False
+        nuevas = [p for p in palabras if p not in self.vocabulario]
+        self.vocabulario.update(palabras)
+        for palabra in nuevas:
+            self._indexar(palabra)
+        self.archivos[ruta] = firma
+        return True
+
+    def quitar(self, ruta):
+        """Olvida un archivo eliminado (sus palabras siguen en el vocabulario)"""
+        self.archivos.pop(ruta, None)
+
+    def actualizar(self, archivos):
+        """
+        Pone el vocabulario al día leyendo solo los archivos nuevos o modificados
+
+        Args:
+            archivos (list): Rutas de todos los archivos TXT del corpus
+
+        Returns:
+            int: Número de archivos leídos u olvidados
+        """
+        actuales = set(archivos)
+        cambios = 0
+        for ruta in [r for r in self.archivos if r not in actuales]:
+            self.quitar(ruta)
+            cambios += 1
+        for ruta in archivos:
+            if self.archivos.get(ruta) != self.firma_archivo(ruta):
+                self.agregar(ruta)
+                cambios += 1
+        return cambios
+
+    def cargar(self, ruta_indice):
+        """
+        Carga el vocabulario y las firmas de archivo de una ejecución anterior
+
+        Returns:
+            bool: True si se pudo reutilizar
+        """
+        if not ruta_indice or not os.path.exists(ruta_indice):
+            return False
+        try:
+            with open(ruta_indice, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if 'archivos' not in datos or 'vocabulario' not in datos:
+            return False
+        self.archivos = {ruta: tuple(firma) for ruta, firma in datos['archivos'].items()}
+        self.vocabulario = Counter(datos['vocabulario'])
+        self._borrados = {}
+        return True
+
+    def guardar(self, ruta_indice):
+        """Escribe el vocabulario y la fecha y tamaño de cada archivo en JSON"""
+        with open(ruta_indice, 'w', encoding='utf-8') as f:
+            json.dump({'archivos': self.archivos, 'vocabulario': self.vocabulario}, f, ensure_ascii=False)
+
+    def _generar_borrados(self, palabra):
+        borrados = {palabra}
+        frontera = {palabra}
+        for _ in range(self.distancia_maxima):
+            frontera = {p[:i] + p[i + 1:] for p in frontera for i in range(len(p))}
+            borrados |= frontera
+        return borrados
+
+    def _indexar(self, palabra):
+        """Añade una palabra nueva al índice de su longitud, si ya está construido"""
+        indice = self._borrados.get(len(palabra))
+        if indice is not None:
+            for borrado in self._generar_borrados(palabra):
+                indice.setdefault(borrado, []).append(palabra)
+
+    def _indice_longitud(self, longitud):
+        """Índice de borrados de las palabras de una longitud (se construye una vez)"""
+        if longitud not in self._borrados:
+            indice = {}
+            for palabra in self.vocabulario:
+                if len(palabra) == longitud:
+                    for borrado in self._generar_borrados(palabra):
+                        indice.setdefault(borrado, []).append(palabra)
+            self._borrados[longitud] = indice
+        return self._borrados[longitud]
+
+    def variantes(self, termino):
+        """
+        Palabras del vocabulario a distancia <= distancia_maxima del término
+
+        Solo se consultan los índices de las longitudes que difieren como
+        mucho distancia_maxima de la del término: las demás palabras no
+        pueden estar a esa distancia.
+
+        Args:
+            termino (str): Palabra buscada
+
+        Returns:
+            list: dicts con forma, distancia y frecuencia, de más a menos parecida
+        """
+        termino = termino.lower()
+        borrados_termino = self._generar_borrados(termino)
+        candidatos = set()
+        for longitud in range(max(1, len(termino) - self.distancia_maxima),
+                              len(termino) + self.distancia_maxima + 1):
+            indice = self._indice_longitud(longitud)
+            for borrado in borrados_termino:
+                candidatos.update(indice.get(borrado, ()))
+
+        encontradas = []
+        for forma in candidatos:
+            distancia = distancia_edicion(termino, forma, self.distancia_maxima)
+            if distancia <= self.distancia_maxima:
+                encontradas.append({'forma': forma, 'distancia': distancia,
+                                    'frecuencia': self.vocabulario[forma]})
+        encontradas.sort(key=lambda v: (v['distancia'], -v['frecuencia'], v['forma']))
+        return encontradas
+
+
+# ==========================================================================
+# ANÁLISIS EN PARALELO DE ARCHIVOS GRANDES
+# ==========================================================================
+
+def extraer_contexto(texto, inicio_match, fin_match):
+    """Fragmento de 100 caracteres antes y después de una aparición, en una línea"""
+    inicio = max(0, inicio_match - 100)
+    fin = min(len(texto), fin_match + 100)
+    contexto = texto[inicio:fin].strip()
+
+    # Limpiar saltos de línea múltiples
+    return re.sub(r'\s+', ' ', contexto)
+
+
+def _decodificar(datos):
+    """Misma decodificación que open(..., encoding='utf-8', errors='ignore') en modo texto"""
+    return datos.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+
+# Bytes de espacio donde se puede cortar un archivo sin partir palabras, caracteres
+# UTF-8 ni saltos de línea \r\n
+_CORTE_SEGURO = re.compile(rb'[ \t\x0b\x0c]|(?<!\r)\n')
+
+# Bytes de texto extra a cada lado de un trozo para extraer los contextos
+# (más que 100 caracteres de hasta 4 bytes)
+_MARGEN_CONTEXTO = 4096
+
+# Contextos que se conservan por archivo
+_MAX_CONTEXTOS = 5
+
+
+def dividir_en_trozos(datos, num_trozos):
+    """
+    Calcula rangos de bytes que empiezan en un espacio seguro
+
+    Args:
+        datos: Contenido del archivo (bytes o mmap)
+        num_trozos (int): Número aproximado de trozos
+
+    Returns:
+        list: (inicio, fin) de cada trozo, contiguos y en orden
+    """
+    tamaño = len(datos)
+    cortes = [0]
+    for i in range(1, num_trozos):
+        nominal = max(tamaño * i // num_trozos, cortes[-1] + 1)
+        m = _CORTE_SEGURO.search(datos, nominal)
+        if m is None:
+            break
+        if m.start() > cortes[-1]:
+            cortes.append(m.start())
+    cortes.append(tamaño)
+    return list(zip(cortes[:-1], cortes[1:]))
+
+
+def _escanear_trozo(tarea):
+    """
+    Analiza un rango de bytes de un archivo en un proceso aparte
+
+    El archivo se abre con mmap en cada proceso: el sistema comparte las
+    páginas y el proceso principal no envía contenido, solo rutas y rangos.
+
+    Args:
+        tarea (tuple): (ruta, inicio, fin, términos, nombre del motor)
+
+    Returns:
+        dict: caracteres, palabras, menciones, primeros contextos (posición
+            relativa al trozo) y formas encontradas
+    """
+    ruta, inicio, fin, terminos, nombre_motor = tarea
+    motor = MOTORES[nombre_motor](terminos)
+
+    with open(ruta, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+        texto = _decodificar(datos[inicio:fin])
+
+        # Márgenes alineados a inicio de carácter UTF-8 (0b10xxxxxx = byte de continuación)
+        izquierda = max(0, inicio - _MARGEN_CONTEXTO)
+        while izquierda < inicio and 0x80 <= datos[izquierda] < 0xC0:
+            izquierda += 1
+        derecha = min(len(datos), fin + _MARGEN_CONTEXTO)
+        while derecha > fin and derecha < len(datos) and 0x80 <= datos[derecha] < 0xC0:
+            derecha -= 1
+        margen_izquierdo = _decodificar(datos[izquierda:inicio])
+        margen_derecho = _decodificar(datos[fin:derecha])
+
+    ampliado = margen_izquierdo + texto + margen_derecho
+    desplazamiento = len(margen_izquierdo)
+
+    apariciones = motor.buscar(texto)
+    contextos = [
+        {
+            'texto': extraer_contexto(ampliado, desplazamiento + a, desplazamiento + b),
+            'posicion': a,
+            'palabra': texto[a:b]
+        }
+        for a, b in apariciones[:_MAX_CONTEXTOS]
+    ]
+
+    return {
+        'caracteres': len(texto),
+        'palabras': len(texto.split()),
+        'menciones': len(apariciones),
+        'contextos': contextos,
+        'formas': Counter(texto[a:b].lower() for a, b in apariciones)
+    }
+
+
+# ==========================================================================
+# CLASE PRINCIPAL DEL BUSCADOR
+# ==========================================================================
+
+class BuscadorPalabrasClave:
+    # Segundos mínimos entre dos avisos de progreso
+    intervalo_progreso = 1.0
+
+    def __init__(self, base_directory, palabra_clave, ventana_colocaciones=0,
+                 limite_vocabulario=LIMITE_VOCABULARIO_COLOCACIONES, verbose=True,
+                 agrupador=None, deduplicador=None, motor='auto',
+                 distancia_maxima=0, archivo_indice=None,
+                 tamaño_minimo_paralelo=None, procesos=None):
+        """
+        Inicializa el buscador de palabra clave
+
+        Args:
+            base_directory (str): Ruta al directorio con archivos TXT
+            palabra_clave (str): Palabra a buscar (no sensible a mayúsculas)
+            ventana_colocaciones (int): Palabras a cada lado para colocaciones (0 = desactivado)
+            limite_vocabulario (int): Máximo de palabras distintas en memoria para colocaciones
+            verbose (bool): Si es False no se imprime nada por pantalla (uso como biblioteca)
+            agrupador (AgrupadorArchivos): Criterios para desglosar el resumen por subcorpus
+            deduplicador (DetectorDuplicados): Omite archivos duplicados antes de buscar
+            motor (str): Motor de búsqueda (ver MOTORES) o 'auto' para elegirlo midiendo una muestra
+            distancia_maxima (int): Distancia de edición para variantes OCR (0 = solo la palabra exacta)
+            archivo_indice (str): JSON donde guardar el vocabulario del corpus entre ejecuciones
+            tamaño_minimo_paralelo (int): Bytes a partir de los cuales un archivo se analiza
+                en paralelo por trozos (None = nunca)
+            procesos (int): Procesos para el análisis en paralelo (None = todos los núcleos)
+        """
+        self.base_directory = base_directory
+        self.palabra_clave = palabra_clave
+        self.resultados = {}
+        self.total_archivos = 0
+        self.total_palabras = 0
+        self.ventana_colocaciones = ventana_colocaciones
+        self.limite_vocabulario = limite_vocabulario
+        self.verbose = verbose
+        self.acumulador = AcumuladorResumen()
+        self.agrupador = agrupador
+        self.acumuladores_grupo = {}
+        self._directorio_actual = base_directory
+        self.deduplicador = deduplicador
+        self.duplicados = {}
+        # Duplicados de cada original: {ruta original: {rutas omitidas}}
+        self._copias_de = {}
+        # Archivos que no se pudieron analizar: [{'ruta', 'error'}]
+        self.errores = []
+        self.cancelado = False
+        # Aportes de colocaciones por archivo (solo en modo vigilancia)
+        self._aportes_colocaciones = None
+        self._reiniciar_colocaciones()
+
+        # Motor de búsqueda: con 'auto' se usa 're' hasta calibrar con el corpus
+        if motor != 'auto' and not (motor in MOTORES and MOTORES[motor].disponible()):
+            raise ValueError(f"Motor de búsqueda no disponible: {motor}")
+        self.motor_solicitado = motor
+        self.calibracion = {}
+        self.distancia_maxima = distancia_maxima
+        self.archivo_indice = archivo_indice
+        # Variantes OCR encontradas en el vocabulario: {forma: distancia}
+        self.variantes_buscadas = {}
+        self.conteo_variantes = Counter()
+        self.indice_vocabulario = None
+        self._vocabulario_pendiente = False
+        self.tamaño_minimo_paralelo = tamaño_minimo_paralelo
+        self.procesos = procesos or os.cpu_count() or 1
+        self.motor = MOTORES['re' if motor == 'auto' else motor](self.terminos_busqueda())
+
+    def terminos_busqueda(self):
+        """Términos que se pasan al motor de búsqueda (palabra clave y variantes OCR)"""
+        return [self.palabra_clave] + [v for v in self.variantes_buscadas
+                                       if v != self.palabra_clave.lower()]
+
+    def resolver_variantes(self, archivos):
+        """
+        Busca en el vocabulario del corpus las variantes OCR de la palabra clave
+
+        El vocabulario se conserva entre llamadas y en el archivo de índice;
+        solo se leen los archivos nuevos o modificados desde la última vez.
+
+        Args:
+            archivos (list): Rutas de los archivos del corpus
+
+        Returns:
+            dict: {forma: distancia} de las variantes que se contarán
+        """
+        if not re.fullmatch(r'\w+', self.palabra_clave):
+            self._log("⚠️  La búsqueda aproximada solo admite una palabra sin espacios ni signos; "
+                      "se busca la forma exacta")
+            self.variantes_buscadas = {}
+            return self.variantes_buscadas
+
+        if self.indice_vocabulario is None:
+            self.indice_vocabulario = IndiceVocabulario(self.distancia_maxima)
+            if self.indice_vocabulario.cargar(self.archivo_indice):
+                self._log(f"📚 Vocabulario reutilizado de {self.archivo_indice}")
+            else:
+                self._log("📚 Construyendo vocabulario del corpus para la búsqueda aproximada...")
+
+        cambios = self.indice_vocabulario.actualizar(archivos)
+        if cambios:
+            self._log(f"📚 Vocabulario actualizado con {cambios} archivos nuevos, modificados o eliminados")
+            if self.archivo_indice:
+                self.indice_vocabulario.guardar(self.archivo_indice)
+
+        return self._elegir_variantes()
+
+    def _elegir_variantes(self, solo_si_cambian=False):
+        """Toma las variantes del vocabulario actual y rehace el motor con ellas"""
+        variantes = {v['forma']: v['distancia']
+                     for v in self.indice_vocabulario.variantes(self.palabra_clave)}
+        if solo_si_cambian and variantes == self.variantes_buscadas:
+            return self.variantes_buscadas
+        self.variantes_buscadas = variantes
+        self.motor = type(self.motor)(self.terminos_busqueda())
+        self._log(f"🔤 Variantes a distancia <= {self.distancia_maxima}: "
+                  f"{', '.join(self.variantes_buscadas) or '—'}")
+        return self.variantes_buscadas
+
+    def calibrar(self, archivos, max_archivos=20, max_caracteres=1000000):
+        """
+        Elige el motor más rápido con una muestra repartida por el corpus
+
+        Args:
+            archivos (list): Rutas de los archivos del corpus
+            max_archivos (int): Número de archivos de la muestra
+            max_caracteres (int): Caracteres leídos de cada archivo de la muestra
+
+        Returns:
+            str: Nombre del motor elegido
+        """
+        paso = max(1, len(archivos) // max_archivos)
+        muestras = []
+        for ruta in archivos[::paso][:max_archivos]:
+            try:
+                with open(ruta, 'r', encoding='utf-8', errors='ignore') as f:
+                    muestras.append(f.read(max_caracteres))
+            except OSError:
+                continue
+
+        terminos = self.terminos_busqueda()
+        nombre, self.calibracion = calibrar_motores(terminos, muestras)
+        self.motor = MOTORES[nombre](terminos)
+        self._log(f"🏎️  Motor de búsqueda: {nombre} " + ", ".join(
+            f"{n}={t * 1000:.1f} ms" if t is not None else f"{n}=descartado"
+            for n, t in self.calibracion.items()
+        ))
+        return nombre
+
+    def buscar_en_texto(self, contenido):
+        """
+        Busca todas las apariciones EXACTAS de la palabra clave en un texto
+
+        Args:
+            contenido (str): Texto a analizar
+
+        Returns:
+            dict: {
+                'total_menciones': int,
+                'contextos': list (fragmentos de texto donde aparece)
+            }
+        """
+        resultado = {
+            'total_menciones': 0,
+            'contextos': []
+        }
+
+        # Buscar la palabra (no sensible a mayúsculas)
+        for inicio_match, fin_match in self.motor.buscar(contenido):
+            palabra_encontrada = contenido[inicio_match:fin_match]
+
+            # Extraer contexto (100 caracteres antes y después)
+            contexto = extraer_contexto(contenido, inicio_match, fin_match)
+
+            resultado['contextos'].append({
+                'texto': contexto,
+                'posicion': inicio_match,
+                'palabra': palabra_encontrada
+            })
+
+            resultado['total_menciones'] += 1
+
+        return resultado
+
+    def analizar_archivo(self, filepath, contenido=None):
+        """
+        Analiza un archivo de texto en busca de la palabra clave
+
+        Args:
+            filepath (str): Ruta al archivo
+            contenido (str): Texto ya leído del archivo (se lee si None)
+
+        Returns:
+            dict: Resultado del análisis del archivo, o None si falla (el error
+                se añade a self.errores)
+        """
+        try:
+            if contenido is None and self._admite_paralelo(filepath):
+                return self._completar_resultado(filepath, *self._analizar_en_paralelo(filepath))
+
+            if contenido is None:
+                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                    contenido = f.read()
+
+            # Conteo de palabras
+            palabras = len(contenido.split())
+
+            # Buscar palabra clave
+            busqueda = self.buscar_en_texto(contenido)
+
+            # Colocaciones (se acumulan con el texto ya leído, sin releer el archivo)
+            if self.ventana_colocaciones > 0:
+                aporte = self.acumular_colocaciones(contenido, busqueda['contextos'])
+                if self._aportes_colocaciones is not None:
+                    self._aportes_colocaciones[filepath] = aporte
+
+            formas = Counter(c['palabra'].lower() for c in busqueda['contextos'])
+            return self._completar_resultado(filepath, palabras, busqueda['total_menciones'],
+                                             busqueda['contextos'], formas)
+
+        except Exception as e:
+            # Se registra para el llamador en lugar de escribirlo siempre en pantalla
+            self.errores.append({'ruta': filepath, 'error': str(e)})
+            self._log(f"❌ Error analizando {filepath}: {e}")
+            return None
+
+    def _completar_resultado(self, filepath, palabras, total_menciones, contextos, formas):
+        """Construye el resultado de un archivo (análisis secuencial o en paralelo)"""
+        resultado = {
+            'archivo': os.path.basename(filepath),
+            'ruta': filepath,
+            'palabras': palabras,
+            'tiene_palabra_clave': total_menciones > 0,
+            'total_menciones': total_menciones,
+            'contextos': contextos[:_MAX_CONTEXTOS]  # Máximo 5 contextos por archivo
+        }
+
+        if self.agrupador:
+            resultado['grupos'] = self.agrupador.grupos(filepath, self._directorio_actual)
+
+        if self.variantes_buscadas:
+            resultado['variantes'] = dict(formas)
+
+        return resultado
+
+    def _admite_paralelo(self, filepath):
+        """
+        Indica si un archivo se puede analizar por trozos con resultados idénticos
+
+        Los trozos se cortan en espacios, así que no es posible si algún
+        término contiene espacios, ni con colocaciones (sus ventanas cruzan
+        los cortes).
+        """
+        if not self.tamaño_minimo_paralelo or self.procesos < 2 or self.ventana_colocaciones > 0:
+            return False
+        if any(re.search(r'\s', t) for t in self.terminos_busqueda()):
+            return False
+        try:
+            return os.path.getsize(filepath) >= self.tamaño_minimo_paralelo
+        except OSError:
+            return False
+
+    def _analizar_en_paralelo(self, filepath):
+        """
+        Analiza un archivo grande dividiéndolo en trozos procesados a la vez
+
+        Los trozos empiezan en un espacio, de modo que ninguna palabra ni
+        carácter queda partido; las posiciones se recalculan sumando la
+        longitud de los trozos anteriores y los contextos se toman en orden.
+
+        Returns:
+            tuple: (palabras, total_menciones, contextos, formas) como en el análisis secuencial
+        """
+        with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            trozos = dividir_en_trozos(datos, self.procesos * 4)
+
+        self._log(f"🧩 {os.path.basename(filepath)}: {len(trozos)} trozos en {self.procesos} procesos")
+
+        terminos = self.terminos_busqueda()
+        tareas = [(filepath, inicio, fin, terminos, self.motor.nombre) for inicio, fin in trozos]
+        with ProcessPoolExecutor(max_workers=self.procesos) as ejecutor:
+            partes = list(ejecutor.map(_escanear_trozo, tareas))
+
+        palabras = 0
+        total_menciones = 0
+        contextos = []
+        formas = Counter()
+        desplazamiento = 0
+        for parte in partes:
+            palabras += parte['palabras']
+            total_menciones += parte['menciones']
+            formas.update(parte['formas'])
+            for ctx in parte['contextos']:
+                if len(contextos) < _MAX_CONTEXTOS:
+                    contextos.append({**ctx, 'posicion': desplazamiento + ctx['posicion']})
+            desplazamiento += parte['caracteres']
+
+        return palabras, total_menciones, contextos, formas
+
+    def _reiniciar_colocaciones(self):
+        """Vacía los contadores de colocaciones antes de un nuevo análisis"""
+        self._frecuencias_corpus = ContadorAcotado(self.limite_vocabulario)
+        self._coocurrencias = ContadorAcotado(self.limite_vocabulario)
+        self._total_tokens = 0
+        self._menciones_nodo = 0
+
+    def acumular_colocaciones(self, contenido, contextos):
+        """
+        Cuenta las palabras dentro de la ventana ±k de cada aparición
+
+        Args:
+            contenido (str): Texto completo del archivo
+            contextos (list): Todas las apariciones devueltas por buscar_en_texto
+
+        Returns:
+            dict: Aporte del archivo (vecinos, frecuencias, tokens, menciones) para poder descontarlo
+        """
+        k = self.ventana_colocaciones
+        tokens = []
+        inicios = []
+        for m in re.finditer(r'\w+', contenido):
+            tokens.append(m.group(0).lower())
+            inicios.append(m.start())
+
+        self._frecuencias_corpus.actualizar(tokens)
+        self._total_tokens += len(tokens)
+
+        vecinos = []
+        menciones = 0
+        for ctx in contextos:
+            # Índices de tokens que ocupa la palabra clave (puede ser compuesta)
+            primero = bisect_left(inicios, ctx['posicion'])
+            siguiente = bisect_left(inicios, ctx['posicion'] + len(ctx['palabra']))
+            vecinos.extend(tokens[max(0, primero - k):primero])
+            vecinos.extend(tokens[siguiente:siguiente + k])
+            menciones += 1
+
+        self._menciones_nodo += menciones
+        if vecinos:
+            self._coocurrencias.actualizar(vecinos)
+
+        # De las frecuencias del archivo solo se guardan las de sus vecinos: guardar
+        # todo su vocabulario haría crecer la memoria con el corpus sin límite
+        vecinos = Counter(vecinos)
+        frecuencias = Counter(t for t in tokens if t in vecinos) if vecinos else Counter()
+        return {'vecinos': vecinos, 'frecuencias': frecuencias,
+                'tokens': len(tokens), 'menciones': menciones}
+
+    def descontar_colocaciones(self, aporte):
+        """
+        Resta el aporte de un archivo a las colocaciones
+
+        Se descuentan las coocurrencias, los totales y las frecuencias del
+        corpus de los vecinos del archivo. Las frecuencias de sus demás
+        palabras se quedan sumadas: solo afectan a palabras que no eran
+        colocados en ese archivo y la desviación es pequeña.
+
+        Args:
+            aporte (dict): Valor devuelto por acumular_colocaciones
+        """
+        self._coocurrencias.restar(aporte['vecinos'])
+        self._frecuencias_corpus.restar(aporte['frecuencias'])
+        self._total_tokens -= aporte['tokens']
+        self._menciones_nodo -= aporte['menciones']
+
+    def calcular_colocaciones(self, min_coocurrencias=2, max_resultados=50):
+        """
+        Calcula medidas de asociación para las palabras cercanas a la clave
+
+        Las frecuencias esperadas usan el tamaño de ventana (2k posiciones por
+        mención). Medidas: PMI, log-likelihood (simple-ll) y t-score. El
+        log-likelihood lleva signo: es negativo si la palabra aparece cerca
+        de la clave menos de lo esperado, así que esas palabras quedan al
+        final de la tabla.
+
+        Args:
+            min_coocurrencias (int): Mínimo de apariciones en ventana para listar un colocado
+            max_resultados (int): Número de colocados a devolver (ordenados por log-likelihood)
+
+        Returns:
+            dict: Tabla de colocados y datos del cálculo
+        """
+        n_total = self._total_tokens
+        amplitud = 2 * self.ventana_colocaciones * self._menciones_nodo
+        colocados = []
+
+        if n_total > 0 and amplitud > 0:
+            for palabra, observado in self._coocurrencias.most_common():
+                if observado < min_coocurrencias:
+                    break
+                frecuencia = max(observado, self._frecuencias_corpus.frecuencia(palabra))
+                esperado = amplitud * frecuencia / n_total
+                log_likelihood = 2 * (observado * math.log(observado / esperado) - (observado - esperado))
+                if observado < esperado:
+                    log_likelihood = -log_likelihood
+                colocados.append({
+                    'palabra': palabra,
+                    'coocurrencias': observado,
+                    'frecuencia_corpus': frecuencia,
+                    'pmi': round(math.log2(observado / esperado), 3),
+                    'log_likelihood': round(log_likelihood, 3),
+                    't_score': round((observado - esperado) / math.sqrt(observado), 3)
+                })
+
+        colocados.sort(key=lambda c: c['log_likelihood'], reverse=True)
+
+        return {
+            'ventana': self.ventana_colocaciones,
+            'total_tokens': n_total,
+            'menciones_nodo': self._menciones_nodo,
+            'min_coocurrencias': min_coocurrencias,
+            'podas_vocabulario': self._frecuencias_corpus.podas + self._coocurrencias.podas,
+            'colocados': colocados[:max_resultados]
+        }
+
+    def listar_archivos_txt(self, directorio):
+        """
+        Busca recursivamente todos los archivos TXT de un directorio
+
+        Args:
+            directorio (str): Ruta al directorio
+
+        Returns:
+            list: Rutas de los archivos TXT encontrados
+        """
+        archivos_txt = []
+        for root, dirs, files in os.walk(directorio):
+            for file in files:
+                if file.endswith('.txt'):
+                    archivos_txt.append(os.path.join(root, file))
+        return archivos_txt
+
+    def _log(self, mensaje):
+        if self.verbose:
+            print(mensaje)
+
+    def _imprimir_progreso(self, estado):
+        """Callback de progreso por defecto: una línea por intervalo, no por archivo"""
+        self._log(
+            f"⚙️  Procesados {estado['procesados']}/{estado['total']} "
+            f"({estado['archivos_por_segundo']:.1f} archivos/s, "
+            f"{estado['bytes_por_segundo'] / 1048576:.1f} MB/s, "
+            f"quedan ~{estado['eta_segundos']:.0f} s)"
+        )
+
+    def iterar_directorio(self, directorio=None, progreso=None, cancelacion=None,
+                          tiempo_maximo=None):
+        """
+        Analiza los archivos TXT de un directorio devolviendo cada resultado al terminarlo
+
+        El resumen se acumula en `self.acumulador` a medida que se consumen los
+        resultados, de modo que está disponible aunque se detenga la iteración.
+
+        Args:
+            directorio (str): Ruta al directorio (usa base_directory si None)
+            progreso (callable): Función que recibe un dict con procesados, total,
+                archivo, segundos, archivos_por_segundo, bytes_por_segundo y
+                eta_segundos. Se llama como mucho una vez por `intervalo_progreso`
+            cancelacion: Objeto con método is_set() (p. ej. threading.Event) que
+                detiene el análisis cuando devuelve True
+            tiempo_maximo (float): Segundos tras los que se detiene el análisis
+
+        Yields:
+            dict: Resultado de analizar_archivo para cada archivo legible
+
+        Raises:
+            FileNotFoundError: Si el directorio no contiene archivos TXT
+        """
+        if directorio is None:
+            directorio = self.base_directory
+        if progreso is None:
+            progreso = self._imprimir_progreso
+
+        self._log(f"📂 Analizando directorio: {directorio}")
+
+        archivos_txt = self.listar_archivos_txt(directorio)
+        total = len(archivos_txt)
+
+        self._log(f"📄 Encontrados {total} archivos TXT")
 
-PALABRA_CLAVE = "Ejemplo"  # ← Cambia esto por tu palabra clave
+        if total == 0:
+            raise FileNotFoundError(f"No se encontraron archivos TXT en el directorio: {directorio}")
 
+        if self.distancia_maxima > 0:
+            self.resolver_variantes(archivos_txt)
 
-# ==========================================================================
-# CLASE PRINCIPAL DEL BUSCADOR
-# ==========================================================================
+        if self.motor_solicitado == 'auto':
+            self.calibrar(archivos_txt)
 
-class BuscadorPalabrasClave:
-    def __init__(self, base_directory, palabra_clave):
+        self._reiniciar_colocaciones()
+        self.acumulador = AcumuladorResumen()
+        self.acumuladores_grupo = {}
+        self.conteo_variantes = Counter()
+        self._directorio_actual = directorio
+        self.cancelado = False
+        self.duplicados = {}
+        self._copias_de = {}
+        self.errores = []
+        if self.deduplicador:
+            self.deduplicador.reiniciar()
+
+        inicio = time.monotonic()
+        ultimo_aviso = inicio
+        bytes_leidos = 0
+
+        for i, filepath in enumerate(archivos_txt, 1):
+            transcurrido = time.monotonic() - inicio
+            if ((cancelacion is not None and cancelacion.is_set())
+                    or (tiempo_maximo is not None and transcurrido >= tiempo_maximo)):
+                self.cancelado = True
+                self._log(f"⏹️  Análisis detenido tras {i - 1}/{total} archivos")
+                break
+
+            resultado = self._analizar_sin_duplicados(filepath)
+            try:
+                bytes_leidos += os.path.getsize(filepath)
+            except OSError:
+                pass
+
+            ahora = time.monotonic()
+            if ahora - ultimo_aviso >= self.intervalo_progreso or i == total:
+                ultimo_aviso = ahora
+                segundos = max(ahora - inicio, 1e-9)
+                por_segundo = i / segundos
+                progreso({
+                    'procesados': i,
+                    'total': total,
+                    'archivo': filepath,
+                    'segundos': segundos,
+                    'archivos_por_segundo': por_segundo,
+                    'bytes_por_segundo': bytes_leidos / segundos,
+                    'eta_segundos': (total - i) / por_segundo
+                })
+
+            if resultado:
+                self._sumar_resultado(resultado)
+                yield resultado
+
+        if self.deduplicador:
+            self.deduplicador.guardar_cache()
+
+    def _analizar_sin_duplicados(self, filepath):
         """
-        Inicializa el buscador de palabra clave
+        Analiza un archivo salvo que duplique a otro ya analizado
+
+        Returns:
+            dict: Resultado de analizar_archivo, o None si es duplicado o hubo error
+        """
+        contenido = None
+        if self.deduplicador:
+            # Un archivo que se analizará en paralelo no se carga entero en memoria
+            leer_contenido = not self._admite_paralelo(filepath)
+            try:
+                duplicado, contenido = self.deduplicador.comprobar(filepath, leer_contenido)
+            except OSError:
+                duplicado = None  # analizar_archivo informará del error
+            if duplicado:
+                self.duplicados[filepath] = {'ruta': filepath, **duplicado}
+                self._copias_de.setdefault(duplicado['duplicado_de'], set()).add(filepath)
+                return None
+        return self.analizar_archivo(filepath, contenido)
+
+    def _sumar_resultado(self, resultado):
+        """Suma un resultado al resumen general y al de cada uno de sus grupos"""
+        self.acumulador.agregar(resultado)
+        self.conteo_variantes.update(resultado.get('variantes', {}))
+        for criterio, valor in resultado.get('grupos', {}).items():
+            por_valor = self.acumuladores_grupo.setdefault(criterio, {})
+            por_valor.setdefault(valor, AcumuladorResumen()).agregar(resultado)
+
+    def _restar_resultado(self, resultado):
+        """Descuenta un resultado del resumen general y de sus grupos"""
+        self.acumulador.quitar(resultado)
+        self.conteo_variantes.subtract(resultado.get('variantes', {}))
+        for criterio, valor in resultado.get('grupos', {}).items():
+            por_valor = self.acumuladores_grupo[criterio]
+            por_valor[valor].quitar(resultado)
+            if por_valor[valor].total_archivos == 0:
+                del por_valor[valor]
+
+    def resumen_por_grupo(self):
+        """
+        Resumen general de cada grupo
+
+        Returns:
+            dict: {criterio: {valor: resumen_general + total_archivos + total_palabras}}
+        """
+        grupos = {}
+        for criterio in sorted(self.acumuladores_grupo):
+            grupos[criterio] = {}
+            for valor in sorted(self.acumuladores_grupo[criterio]):
+                acumulador = self.acumuladores_grupo[criterio][valor]
+                grupos[criterio][valor] = {
+                    'total_archivos': acumulador.total_archivos,
+                    'total_palabras': acumulador.total_palabras,
+                    **acumulador.resumen_general()
+                }
+        return grupos
+
+    def analizar_directorio(self, directorio=None, progreso=None, cancelacion=None,
+                            tiempo_maximo=None):
+        """
+        Analiza todos los archivos TXT en un directorio
 
         Args:
-            base_directory (str): Ruta al directorio con archivos TXT
-            palabra_clave (str): Palabra a buscar (no sensible a mayúsculas)
+            directorio (str): Ruta al directorio (usa base_directory si None)
+            progreso, cancelacion, tiempo_maximo: Ver iterar_directorio
+
+        Returns:
+            dict: Resultados completos del análisis
+
+        Raises:
+            FileNotFoundError: Si el directorio no contiene archivos TXT
         """
-        self.base_directory = base_directory
-        self.palabra_clave = palabra_clave
-        self.resultados = {}
-        self.total_archivos = 0
-        self.total_palabras = 0
+        if directorio is None:
+            directorio = self.base_directory
 
-        # Crear patrón regex para la palabra exacta (case-insensitive)
-        # \b = límite de palabra (busca palabras completas, no dentro de otras)
-        # re.IGNORECASE = busca en cualquier combinación de mayúsculas/minúsculas
-        self.patron = re.compile(r'\b' + re.escape(palabra_clave) + r'\b', re.IGNORECASE)
+        resultados_archivos = list(self.iterar_directorio(
+            directorio, progreso=progreso, cancelacion=cancelacion, tiempo_maximo=tiempo_maximo
+        ))
 
-    def buscar_en_texto(self, contenido):
+        return self.consolidar_resultados(directorio, resultados_archivos)
+
+    def consolidar_resultados(self, directorio, resultados_archivos):
         """
-        Busca todas las apariciones EXACTAS de la palabra clave en un texto
+        Construye self.resultados a partir del resumen acumulado
 
         Args:
-            contenido (str): Texto a analizar
+            directorio (str): Directorio analizado
+            resultados_archivos (list): Resultados por archivo
 
         Returns:
-            dict: {
-                'total_menciones': int,
-                'contextos': list (fragmentos de texto donde aparece)
-            }
+            dict: Resultados completos del análisis
         """
-        resultado = {
-            'total_menciones': 0,
-            'contextos': []
+        self.resultados = {
+            'metadata': {
+                'directorio': directorio,
+                'total_archivos': self.acumulador.total_archivos,
+                'total_palabras': self.acumulador.total_palabras,
+                'fecha_analisis': datetime.now().isoformat(),
+                'palabra_buscada': self.palabra_clave,
+                'completo': not self.cancelado,
+                'archivos_duplicados_omitidos': len(self.duplicados),
+                'archivos_con_error': len(self.errores),
+                'motor_busqueda': self.motor.nombre
+            },
+            'resumen_general': self.acumulador.resumen_general(),
+            'archivos': resultados_archivos
         }
 
-        # Buscar el patrón (no sensible a mayúsculas)
-        matches = list(self.patron.finditer(contenido))
+        if self.errores:
+            self.resultados['errores'] = list(self.errores)
 
-        for match in matches:
-            palabra_encontrada = match.group(0)
-
-            # Extraer contexto (100 caracteres antes y después)
-            inicio = max(0, match.start() - 100)
-            fin = min(len(contenido), match.end() + 100)
-            contexto = contenido[inicio:fin].strip()
+        if self.deduplicador:
+            self.resultados['duplicados'] = list(self.duplicados.values())
 
-            # Limpiar saltos de línea múltiples
-            contexto = re.sub(r'\s+', ' ', contexto)
+        if self.agrupador:
+            self.resultados['grupos'] = self.resumen_por_grupo()
 
-            resultado['contextos'].append({
-                'texto': contexto,
-                'posicion': match.start(),
-                'palabra': palabra_encontrada
-            })
+        if self.variantes_buscadas:
+            self.resultados['variantes'] = {
+                'distancia_maxima': self.distancia_maxima,
+                'formas': sorted(
+                    ({'forma': forma, 'distancia': distancia,
+                      'menciones': max(0, self.conteo_variantes.get(forma, 0))}
+                     for forma, distancia in self.variantes_buscadas.items()),
+                    key=lambda v: (-v['menciones'], v['distancia'], v['forma'])
+                )
+            }
 
-            resultado['total_menciones'] += 1
+        if self.ventana_colocaciones > 0:
+            self.resultados['colocaciones'] = self.calcular_colocaciones()
 
-        return resultado
+        return self.resultados
 
-    def analizar_archivo(self, filepath):
+    def estado_archivos(self, directorio):
         """
-        Analiza un archivo de texto en busca de la palabra clave
+        Recorre el directorio y devuelve fecha de modificación y tamaño de cada TXT
+
+        Solo consulta metadatos del sistema de archivos (stat), sin leer contenidos.
 
         Args:
-            filepath (str): Ruta al archivo
+            directorio (str): Ruta al directorio
 
         Returns:
-            dict: Resultado del análisis del archivo
+            dict: {ruta: (mtime_ns, tamaño)}
         """
-        try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                contenido = f.read()
+        estado = {}
+        pendientes = [directorio]
+        while pendientes:
+            actual = pendientes.pop()
+            try:
+                with os.scandir(actual) as entradas:
+                    for entrada in entradas:
+                        try:
+                            # Igual que os.walk en listar_archivos_txt: los enlaces a
+                            # directorios no se recorren
+                            if entrada.is_dir():
+                                if not entrada.is_symlink():
+                                    pendientes.append(entrada.path)
+                            elif entrada.name.endswith('.txt'):
+                                info = entrada.stat()
+                                estado[entrada.path] = (info.st_mtime_ns, info.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return estado
+
+    @staticmethod
+    def comparar_estados(anterior, nuevo):
+        """
+        Compara dos estados de estado_archivos
 
-            # Conteo de palabras
-            palabras = len(contenido.split())
+        Returns:
+            tuple: (añadidos, modificados, eliminados) como listas de rutas
+        """
+        añadidos = [ruta for ruta in nuevo if ruta not in anterior]
+        modificados = [ruta for ruta in nuevo if ruta in anterior and nuevo[ruta] != anterior[ruta]]
+        eliminados = [ruta for ruta in anterior if ruta not in nuevo]
+        return añadidos, modificados, eliminados
 
-            # Buscar palabra clave
-            busqueda = self.buscar_en_texto(contenido)
+    def aplicar_cambios(self, resultados_por_ruta, añadidos, modificados, eliminados):
+        """
+        Actualiza resultados y resumen analizando solo los archivos cambiados
 
-            # Construir resultado
-            resultado = {
-                'archivo': os.path.basename(filepath),
-                'ruta': filepath,
-                'palabras': palabras,
-                'tiene_palabra_clave': busqueda['total_menciones'] > 0,
-                'total_menciones': busqueda['total_menciones'],
-                'contextos': busqueda['contextos'][:5]  # Máximo 5 contextos por archivo
-            }
+        Args:
+            resultados_por_ruta (dict): {ruta: resultado}, se modifica en el sitio
+            añadidos, modificados, eliminados (list): Rutas devueltas por comparar_estados
+
+        Returns:
+            list: Rutas cuyo resultado ha cambiado (incluidas las copias que se
+                vuelven a analizar al cambiar su original)
+        """
+        # Una variante nueva solo puede venir de los archivos cambiados, que ya se
+        # reanalizan con el motor actualizado
+        if self.distancia_maxima > 0:
+            self._actualizar_variantes(añadidos + modificados, eliminados)
+
+        cambiados = set(modificados + eliminados)
+        self.errores = [e for e in self.errores if e['ruta'] not in cambiados]
+
+        # Copias de un original que cambia o desaparece: hay que volver a comprobarlas
+        huerfanos = []
+        for ruta in modificados + eliminados:
+            for copia in sorted(self._copias_de.pop(ruta, ())):
+                if copia not in cambiados and self.duplicados.pop(copia, None) is not None:
+                    huerfanos.append(copia)
+
+        for ruta in modificados + eliminados:
+            omitido = self.duplicados.pop(ruta, None)
+            if omitido is not None:
+                self._copias_de.get(omitido['duplicado_de'], set()).discard(ruta)
+            if self.deduplicador:
+                self.deduplicador.olvidar(ruta)
+            anterior = resultados_por_ruta.pop(ruta, None)
+            if anterior is not None:
+                self._restar_resultado(anterior)
+            if self._aportes_colocaciones is not None and ruta in self._aportes_colocaciones:
+                self.descontar_colocaciones(self._aportes_colocaciones.pop(ruta))
+
+        for ruta in añadidos + modificados + huerfanos:
+            resultado = self._analizar_sin_duplicados(ruta)
+            if resultado:
+                resultados_por_ruta[ruta] = resultado
+                self._sumar_resultado(resultado)
 
-            return resultado
+        if self.deduplicador:
+            self.deduplicador.guardar_cache()
 
-        except Exception as e:
-            print(f"❌ Error analizando {filepath}: {e}")
-            return None
+        return añadidos + modificados + eliminados + huerfanos
 
-    def analizar_directorio(self, directorio=None):
+    def _actualizar_variantes(self, cambiados, eliminados):
         """
-        Analiza todos los archivos TXT en un directorio
+        Actualiza el vocabulario con los archivos cambiados y vuelve a elegir las variantes
+
+        El archivo de índice no se reescribe aquí (su tamaño depende del
+        vocabulario, no del cambio): vigilar lo guarda al terminar.
 
         Args:
-            directorio (str): Ruta al directorio (usa base_directory si None)
+            cambiados (list): Rutas añadidas o modificadas
+            eliminados (list): Rutas eliminadas
+        """
+        if not re.fullmatch(r'\w+', self.palabra_clave):
+            return
+        if self.indice_vocabulario is None:
+            # El directorio estaba vacío en el análisis inicial
+            self.resolver_variantes(cambiados)
+            return
+        for ruta in eliminados:
+            self.indice_vocabulario.quitar(ruta)
+        for ruta in cambiados:
+            self.indice_vocabulario.agregar(ruta)
+        self._vocabulario_pendiente = True
+        self._elegir_variantes(solo_si_cambian=True)
+
+    def vigilar(self, directorio=None, intervalo_sondeo=INTERVALO_SONDEO,
+                intervalo_escritura=INTERVALO_ESCRITURA,
+                salida_json='resultados_busqueda.json', salida_html='resultados_busqueda.html',
+                cancelacion=None, almacen=None):
+        """
+        Mantiene los resultados actualizados mientras llegan archivos nuevos
 
-        Returns:
-            dict: Resultados completos del análisis
+        Tras un análisis inicial completo, comprueba el directorio cada
+        `intervalo_sondeo` segundos y analiza solo los archivos añadidos o
+        modificados, descontando los modificados y eliminados del resumen.
+        El JSON y el HTML se reescriben como mucho una vez por
+        `intervalo_escritura` segundos y solo si hubo cambios. Si se indica un
+        almacén, la sesión guarda una sola ejecución en el histórico y cada
+        escritura actualiza sus totales y las filas de los archivos cambiados.
+
+        Args:
+            directorio (str): Ruta al directorio (usa base_directory si None)
+            intervalo_sondeo (float): Segundos entre comprobaciones
+            intervalo_escritura (float): Segundos mínimos entre escrituras
+            salida_json (str): Archivo JSON de resultados
+            salida_html (str): Archivo HTML de resultados
+            cancelacion: Objeto con método is_set() que detiene la vigilancia
+                (también se detiene con Ctrl+C)
+            almacen (AlmacenResultados): Histórico donde guardar cada escritura
         """
         if directorio is None:
             directorio = self.base_directory
 
-        print(f"📂 Analizando directorio: {directorio}")
+        # El estado se toma antes del análisis: lo que cambie durante él se detecta después
+        estado = self.estado_archivos(directorio)
 
-        # Buscar todos los archivos TXT
-        archivos_txt = []
-        for root, dirs, files in os.walk(directorio):
-            for file in files:
-                if file.endswith('.txt'):
-                    archivos_txt.append(os.path.join(root, file))
+        resultados_por_ruta = {}
+        self._aportes_colocaciones = {} if self.ventana_colocaciones > 0 else None
+        try:
+            for resultado in self.iterar_directorio(directorio):
+                resultados_por_ruta[resultado['ruta']] = resultado
+        except FileNotFoundError:
+            self._log("⏳ Aún no hay archivos TXT; esperando a que lleguen...")
+
+        ejecucion_id = None
+        rutas_pendientes = set()
+
+        def escribir():
+            nonlocal ejecucion_id
+            self.consolidar_resultados(directorio, list(resultados_por_ruta.values()))
+            self.guardar_resultados(salida_json)
+            self.generar_web_interactiva(salida_html)
+            if almacen is not None:
+                if ejecucion_id is None:
+                    ejecucion_id = almacen.guardar(self.resultados)
+                    self._log(f"🗄️  Ejecución #{ejecucion_id} guardada en el histórico")
+                else:
+                    almacen.actualizar(ejecucion_id, self.resultados, rutas_pendientes)
+            rutas_pendientes.clear()
 
-        print(f"📄 Encontrados {len(archivos_txt)} archivos TXT")
+        escribir()
+        ultima_escritura = time.monotonic()
+        pendiente = False
 
-        if len(archivos_txt) == 0:
-            print("❌ No se encontraron archivos TXT en el directorio")
-            sys.exit(1)
+        self._log(f"👀 Vigilando {directorio} (Ctrl+C para terminar)")
+        try:
+            while cancelacion is None or not cancelacion.is_set():
+                time.sleep(intervalo_sondeo)
+
+                nuevo_estado = self.estado_archivos(directorio)
+                añadidos, modificados, eliminados = self.comparar_estados(estado, nuevo_estado)
+                estado = nuevo_estado
+
+                if añadidos or modificados or eliminados:
+                    rutas_pendientes.update(
+                        self.aplicar_cambios(resultados_por_ruta, añadidos, modificados, eliminados))
+                    pendiente = True
+                    self._log(f"🔄 {len(añadidos)} nuevos, {len(modificados)} modificados, "
+                              f"{len(eliminados)} eliminados")
+
+                if pendiente and time.monotonic() - ultima_escritura >= intervalo_escritura:
+                    escribir()
+                    ultima_escritura = time.monotonic()
+                    pendiente = False
+        except KeyboardInterrupt:
+            self._log("\n⏹️  Vigilancia detenida")
+
+        if pendiente:
+            escribir()
+        if self._vocabulario_pendiente and self.archivo_indice:
+            self.indice_vocabulario.guardar(self.archivo_indice)
+            self._vocabulario_pendiente = False
 
-        # Analizar cada archivo
-        resultados_archivos = []
-        total_menciones = 0
-        archivos_con_palabra = 0
-        archivos_sin_palabra = 0
-        total_palabras = 0
+        return self.resultados
 
-        for i, filepath in enumerate(archivos_txt, 1):
-            print(f"⚙️  Procesando {i}/{len(archivos_txt)}: {os.path.basename(filepath)}")
+    def _html_grupos(self):
+        """Secciones HTML comparativas por grupo (vacío si no hay agrupación)"""
+        html = ''
+        for n, (criterio, valores) in enumerate(self.resultados.get('grupos', {}).items(), 1):
+            filas = ''
+            for valor, r in valores.items():
+                filas += f"""
+                    <tr>
+                        <td><strong>{valor}</strong></td>
+                        <td>{r['total_archivos']}</td>
+                        <td>{r['total_palabras']:,}</td>
+                        <td>{r['archivos_con_palabra']} ({r['porcentaje_con_palabra']}%)</td>
+                        <td><span class="menciones-badge">{r['total_menciones']}</span></td>
+                        <td>{r['frecuencia_por_millon_palabras']}</td>
+                    </tr>
+"""
+            html += f"""
+        <div class="table-section">
+            <h2>🗂️ Comparativa por {criterio}</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th style="width: 30%;">{criterio.capitalize()}</th>
+                        <th style="width: 10%;">Archivos</th>
+                        <th style="width: 15%;">Palabras</th>
+                        <th style="width: 15%;">Con palabra</th>
+                        <th style="width: 15%;">Menciones</th>
+                        <th style="width: 15%;">Por millón</th>
+                    </tr>
+                </thead>
+                <tbody>
+{filas}
+                </tbody>
+            </table>
+            <div class="chart-container" style="margin-top: 20px;">
+                <canvas id="grupoChart{n}"></canvas>
+            </div>
+            <script>
+                new Chart(document.getElementById('grupoChart{n}').getContext('2d'), {{
+                    type: 'bar',
+                    data: {{
+                        labels: {json.dumps(list(valores), ensure_ascii=False)},
+                        datasets: [{{
+                            label: 'Menciones por millón de palabras',
+                            data: {json.dumps([r['frecuencia_por_millon_palabras'] for r in valores.values()])},
+                            backgroundColor: '#764ba2',
+                            borderRadius: 8
+                        }}]
+                    }},
+                    options: {{
+                        responsive: true,
+                        scales: {{ y: {{ beginAtZero: true }} }}
+                    }}
+                }});
+            </script>
+        </div>
+"""
+        return html
 
-            resultado = self.analizar_archivo(filepath)
-            if resultado:
-                resultados_archivos.append(resultado)
-                total_menciones += resultado['total_menciones']
-                total_palabras += resultado['palabras']
+    def _html_variantes(self):
+        """Sección HTML con las variantes OCR encontradas (vacía si no se buscaron)"""
+        variantes = self.resultados.get('variantes')
+        if not variantes:
+            return ''
 
-                if resultado['tiene_palabra_clave']:
-                    archivos_con_palabra += 1
-                else:
-                    archivos_sin_palabra += 1
+        filas = ''
+        for v in variantes['formas']:
+            filas += f"""
+                    <tr>
+                        <td><strong>{v['forma']}</strong></td>
+                        <td>{v['distancia']}</td>
+                        <td><span class="menciones-badge">{v['menciones']}</span></td>
+                    </tr>
+"""
 
-        # Calcular porcentajes
-        porcentaje_con_palabra = round(
-            (archivos_con_palabra / len(resultados_archivos) * 100)
-            if len(resultados_archivos) > 0 else 0, 2
-        )
+        return f"""
+        <div class="table-section">
+            <h2>🔤 Variantes encontradas (distancia ≤ {variantes['distancia_maxima']})</h2>
+            <p>Formas del corpus parecidas a "{self.resultados['metadata']['palabra_buscada']}"
+            (posibles errores de OCR) incluidas en el recuento.</p>
+            <table>
+                <thead>
+                    <tr>
+                        <th style="width: 50%;">Forma</th>
+                        <th style="width: 25%;">Distancia</th>
+                        <th style="width: 25%;">Menciones</th>
+                    </tr>
+                </thead>
+                <tbody>
+{filas}
+                </tbody>
+            </table>
+        </div>
+"""
 
-        porcentaje_sin_palabra = round(
-            (archivos_sin_palabra / len(resultados_archivos) * 100)
-            if len(resultados_archivos) > 0 else 0, 2
-        )
+    def _html_duplicados(self):
+        """Sección HTML con los archivos omitidos por duplicados (vacía si no hay)"""
+        duplicados = self.resultados.get('duplicados')
+        if not duplicados:
+            return ''
 
-        # Frecuencia relativa (menciones por millón de palabras)
-        frecuencia_por_millon = round(
-            (total_menciones / total_palabras * 1000000)
-            if total_palabras > 0 else 0, 2
-        )
+        filas = ''
+        for d in duplicados:
+            tipo = 'Idéntico' if d['tipo'] == 'exacto' else f"Casi idéntico ({d['similitud'] * 100:.0f}%)"
+            filas += f"""
+                    <tr>
+                        <td>{d['ruta']}</td>
+                        <td>{d['duplicado_de']}</td>
+                        <td>{tipo}</td>
+                    </tr>
+"""
 
-        # Consolidar resultados
-        self.resultados = {
-            'metadata': {
-                'directorio': directorio,
-                'total_archivos': len(resultados_archivos),
-                'total_palabras': total_palabras,
-                'fecha_analisis': datetime.now().isoformat(),
-                'palabra_buscada': self.palabra_clave
-            },
-            'resumen_general': {
-                'total_menciones': total_menciones,
-                'archivos_con_palabra': archivos_con_palabra,
-                'archivos_sin_palabra': archivos_sin_palabra,
-                'porcentaje_con_palabra': porcentaje_con_palabra,
-                'porcentaje_sin_palabra': porcentaje_sin_palabra,
-                'frecuencia_por_millon_palabras': frecuencia_por_millon
-            },
-            'archivos': resultados_archivos
-        }
+        return f"""
+        <div class="table-section">
+            <h2>🧬 Duplicados omitidos ({len(duplicados)})</h2>
+            <p>Estos archivos no se incluyen en las estadísticas porque repiten el contenido de otro.</p>
+            <table>
+                <thead>
+                    <tr>
+                        <th style="width: 40%;">Archivo omitido</th>
+                        <th style="width: 40%;">Duplicado de</th>
+                        <th style="width: 20%;">Tipo</th>
+                    </tr>
+                </thead>
+                <tbody>
+{filas}
+                </tbody>
+            </table>
+        </div>
+"""
 
-        return self.resultados
+    def _html_colocaciones(self):
+        """Sección HTML con la tabla de colocaciones (vacía si no se calcularon)"""
+        colocaciones = self.resultados.get('colocaciones')
+        if not colocaciones:
+            return ''
+
+        filas = ''
+        for i, c in enumerate(colocaciones['colocados'], 1):
+            filas += f"""
+                    <tr>
+                        <td><strong>{i}</strong></td>
+                        <td>{c['palabra']}</td>
+                        <td><span class="menciones-badge">{c['coocurrencias']}</span></td>
+                        <td>{c['frecuencia_corpus']:,}</td>
+                        <td>{c['pmi']}</td>
+                        <td>{c['log_likelihood']}</td>
+                        <td>{c['t_score']}</td>
+                    </tr>
+"""
+        if not filas:
+            filas = """
+                    <tr><td colspan="7">No hay colocados con suficientes apariciones.</td></tr>
+"""
+
+        return f"""
+        <div class="table-section">
+            <h2>🔗 Colocaciones (±{colocaciones['ventana']} palabras)</h2>
+            <p>Palabras que aparecen cerca de "{self.resultados['metadata']['palabra_buscada']}"
+            en {colocaciones['menciones_nodo']} menciones, comparadas con su frecuencia en
+            {colocaciones['total_tokens']:,} palabras del corpus.</p>
+            <table>
+                <thead>
+                    <tr>
+                        <th style="width: 5%;">#</th>
+                        <th style="width: 25%;">Palabra</th>
+                        <th style="width: 15%;">Coocurrencias</th>
+                        <th style="width: 15%;">Frecuencia en corpus</th>
+                        <th style="width: 10%;">PMI</th>
+                        <th style="width: 15%;">Log-likelihood</th>
+                        <th style="width: 15%;">T-score</th>
+                    </tr>
+                </thead>
+                <tbody>
+{filas}
+                </tbody>
+            </table>
+        </div>
+"""
 
     def guardar_resultados(self, output_file='resultados_busqueda.json'):
         """
@@ -232,7 +2177,7 @@ class BuscadorPalabrasClave:
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(self.resultados, f, ensure_ascii=False, indent=2)
 
-        print(f"\n✅ Resultados guardados en: {output_file}")
+        self._log(f"\n✅ Resultados guardados en: {output_file}")
         return output_file
 
     def generar_web_interactiva(self, output_file='resultados_busqueda.html'):
@@ -256,6 +2201,12 @@ class BuscadorPalabrasClave:
             key=lambda x: x['archivo']
         )
 
+        # Palabra buscada y sus variantes OCR, para resaltarlas en los contextos
+        formas = [meta['palabra_buscada']] + [
+            v['forma'] for v in self.resultados.get('variantes', {}).get('formas', [])
+        ]
+        terminos_resaltado = '|'.join(re.escape(f) for f in sorted(set(formas), key=len, reverse=True))
+
         html_content = f"""<!DOCTYPE html>
 <html lang="es">
 <head>
@@ -601,7 +2552,7 @@ class BuscadorPalabrasClave:
                 for i, ctx in enumerate(archivo['contextos'], 1):
                     # Resaltar la palabra buscada (case-insensitive)
                     texto_resaltado = re.sub(
-                        rf'\b({re.escape(meta["palabra_buscada"])})\b',
+                        rf'\b({terminos_resaltado})\b',
                         r'<strong>\1</strong>',
                         ctx['texto'],
                         flags=re.IGNORECASE
@@ -650,11 +2601,11 @@ class BuscadorPalabrasClave:
                 </tbody>
             </table>
         </div>
-
+{self._html_variantes()}{self._html_grupos()}{self._html_colocaciones()}{self._html_duplicados()}
         <div class="metadata">
             <strong>📂 Directorio analizado:</strong> {meta['directorio']}<br>
             <strong>📅 Fecha de análisis:</strong> {meta['fecha_analisis']}<br>
-            <strong>📝 Total palabras procesadas:</strong> {meta['total_palabras']:,}<br>
+            <strong>📝 Total palabras procesadas:</strong> {meta['total_palabras']:,}<br>{'' if meta.get('completo', True) else chr(10) + '            <strong>⏹️ Análisis incompleto:</strong> se detuvo antes de procesar todos los archivos<br>'}
             <strong>🔍 Palabra buscada:</strong> "{meta['palabra_buscada']}" (búsqueda de palabra completa, no sensible a mayúsculas)
         </div>
 
@@ -800,10 +2751,346 @@ class BuscadorPalabrasClave:
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(html_content)
 
-        print(f"✅ Web interactiva generada: {output_file}")
+        self._log(f"✅ Web interactiva generada: {output_file}")
         return output_file
 
 
+# ==========================================================================
+# HISTÓRICO DE RESULTADOS EN SQLITE
+# ==========================================================================
+
+class AlmacenResultados:
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS ejecuciones (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            palabra TEXT NOT NULL,
+            palabra_normalizada TEXT NOT NULL,
+            directorio TEXT NOT NULL,
+            fecha TEXT NOT NULL,
+            total_archivos INTEGER NOT NULL,
+            total_palabras INTEGER NOT NULL,
+            total_menciones INTEGER NOT NULL,
+            datos_json TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS archivos (
+            ejecucion_id INTEGER NOT NULL REFERENCES ejecuciones(id) ON DELETE CASCADE,
+            orden INTEGER NOT NULL,
+            ruta TEXT NOT NULL,
+            archivo TEXT NOT NULL,
+            carpeta TEXT NOT NULL,
+            palabras INTEGER NOT NULL,
+            menciones INTEGER NOT NULL,
+            grupos_json TEXT,
+            PRIMARY KEY (ejecucion_id, orden)
+        );
+        CREATE TABLE IF NOT EXISTS contextos (
+            ejecucion_id INTEGER NOT NULL REFERENCES ejecuciones(id) ON DELETE CASCADE,
+            orden_archivo INTEGER NOT NULL,
+            orden INTEGER NOT NULL,
+            texto TEXT NOT NULL,
+            posicion INTEGER NOT NULL,
+            palabra TEXT NOT NULL,
+            PRIMARY KEY (ejecucion_id, orden_archivo, orden)
+        );
+        CREATE INDEX IF NOT EXISTS idx_ejecuciones_palabra
+            ON ejecuciones (palabra_normalizada, id);
+        CREATE INDEX IF NOT EXISTS idx_archivos_menciones
+            ON archivos (ejecucion_id, menciones DESC);
+        CREATE INDEX IF NOT EXISTS idx_archivos_carpeta
+            ON archivos (ejecucion_id, carpeta);
+        CREATE INDEX IF NOT EXISTS idx_archivos_ruta
+            ON archivos (ruta);
+    """
+
+    def __init__(self, ruta_db):
+        """
+        Guarda cada ejecución (metadatos, conteos por archivo y contextos) en SQLite
+
+        Args:
+            ruta_db (str): Archivo de la base de datos (se crea si no existe)
+        """
+        self.ruta_db = ruta_db
+        self.conexion = sqlite3.connect(ruta_db)
+        self.conexion.row_factory = sqlite3.Row
+        self.conexion.execute("PRAGMA foreign_keys = ON")
+        self.conexion.execute("PRAGMA journal_mode = WAL")
+        self.conexion.execute("PRAGMA synchronous = NORMAL")
+        self.conexion.executescript(self.ESQUEMA)
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def guardar(self, resultados):
+        """
+        Inserta una ejecución completa en una sola transacción
+
+        Args:
+            resultados (dict): Resultados de BuscadorPalabrasClave
+
+        Returns:
+            int: Identificador de la ejecución
+        """
+        meta = resultados['metadata']
+
+        with self.conexion:
+            cursor = self.conexion.execute(
+                """INSERT INTO ejecuciones (palabra, palabra_normalizada, directorio, fecha,
+                       total_archivos, total_palabras, total_menciones, datos_json)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (meta['palabra_buscada'], meta['palabra_buscada'].lower(), meta['directorio'],
+                 *self._totales(resultados))
+            )
+            ejecucion_id = cursor.lastrowid
+            self._insertar_archivos(ejecucion_id, meta['directorio'],
+                                    enumerate(resultados['archivos']))
+
+        return ejecucion_id
+
+    def actualizar(self, ejecucion_id, resultados, rutas):
+        """
+        Actualiza en el sitio una ejecución guardada, reescribiendo solo algunos archivos
+
+        Lo usa el modo vigilancia: una sola ejecución por sesión cuyos totales
+        se renuevan y cuyas filas solo cambian para los archivos afectados.
+
+        Args:
+            ejecucion_id (int): Ejecución devuelta por guardar
+            resultados (dict): Resultados actuales de BuscadorPalabrasClave
+            rutas (iterable): Archivos añadidos, modificados o eliminados desde
+                la última escritura
+        """
+        meta = resultados['metadata']
+        por_ruta = {a['ruta']: a for a in resultados['archivos']}
+
+        with self.conexion:
+            self.conexion.execute(
+                """UPDATE ejecuciones SET fecha = ?, total_archivos = ?, total_palabras = ?,
+                       total_menciones = ?, datos_json = ?
+                   WHERE id = ?""",
+                (*self._totales(resultados), ejecucion_id)
+            )
+            siguiente = self.conexion.execute(
+                "SELECT COALESCE(MAX(orden), -1) + 1 FROM archivos WHERE ejecucion_id = ?",
+                (ejecucion_id,)
+            ).fetchone()[0]
+
+            nuevas = []
+            for ruta in rutas:
+                fila = self.conexion.execute(
+                    "SELECT orden FROM archivos WHERE ejecucion_id = ? AND ruta = ?",
+                    (ejecucion_id, ruta)
+                ).fetchone()
+                if fila is not None:
+                    orden = fila[0]
+                    self.conexion.execute(
+                        "DELETE FROM contextos WHERE ejecucion_id = ? AND orden_archivo = ?",
+                        (ejecucion_id, orden))
+                    self.conexion.execute(
+                        "DELETE FROM archivos WHERE ejecucion_id = ? AND orden = ?",
+                        (ejecucion_id, orden))
+                else:
+                    orden = siguiente
+                    siguiente += 1
+                if ruta in por_ruta:
+                    nuevas.append((orden, por_ruta[ruta]))
+
+            self._insertar_archivos(ejecucion_id, meta['directorio'], nuevas)
+
+    @staticmethod
+    def _totales(resultados):
+        """Columnas de ejecuciones que cambian con los resultados"""
+        meta = resultados['metadata']
+        # Todo salvo la lista de archivos, que va en sus propias tablas
+        datos = {clave: valor for clave, valor in resultados.items() if clave != 'archivos'}
+        return (meta['fecha_analisis'], meta['total_archivos'], meta['total_palabras'],
+                resultados['resumen_general']['total_menciones'],
+                json.dumps(datos, ensure_ascii=False))
+
+    def _insertar_archivos(self, ejecucion_id, directorio, archivos):
+        """Inserta las filas de archivos y contextos de pares (orden, archivo)"""
+        filas_archivos = []
+        filas_contextos = []
+        for orden, a in archivos:
+            carpeta = os.path.dirname(os.path.relpath(a['ruta'], directorio)) or '.'
+            grupos = json.dumps(a['grupos'], ensure_ascii=False) if 'grupos' in a else None
+            filas_archivos.append((ejecucion_id, orden, a['ruta'], a['archivo'], carpeta,
+                                   a['palabras'], a['total_menciones'], grupos))
+            for i, ctx in enumerate(a['contextos']):
+                filas_contextos.append((ejecucion_id, orden, i, ctx['texto'],
+                                        ctx['posicion'], ctx['palabra']))
+
+        self.conexion.executemany(
+            "INSERT INTO archivos VALUES (?, ?, ?, ?, ?, ?, ?, ?)", filas_archivos
+        )
+        self.conexion.executemany(
+            "INSERT INTO contextos VALUES (?, ?, ?, ?, ?, ?)", filas_contextos
+        )
+
+    def ejecuciones(self):
+        """Lista de ejecuciones guardadas, de la más reciente a la más antigua"""
+        return [dict(fila) for fila in self.conexion.execute(
+            """SELECT id, palabra, directorio, fecha, total_archivos, total_palabras, total_menciones
+               FROM ejecuciones ORDER BY id DESC"""
+        )]
+
+    def ultima_ejecucion(self, palabra):
+        """
+        Identificador de la ejecución más reciente de una palabra (None si no hay)
+        """
+        fila = self.conexion.execute(
+            "SELECT MAX(id) FROM ejecuciones WHERE palabra_normalizada = ?", (palabra.lower(),)
+        ).fetchone()
+        return fila[0]
+
+    def top_archivos(self, palabra, limite=10, ejecucion_id=None):
+        """
+        Archivos con más menciones de una palabra
+
+        Args:
+            palabra (str): Palabra buscada
+            limite (int): Número de archivos
+            ejecucion_id (int): Ejecución concreta (la más reciente de la palabra si None)
+
+        Returns:
+            list: dicts con ruta, palabras, menciones y menciones por millón
+        """
+        if ejecucion_id is None:
+            ejecucion_id = self.ultima_ejecucion(palabra)
+        return [dict(fila) for fila in self.conexion.execute(
+            """SELECT ruta, palabras, menciones,
+                      ROUND(menciones * 1000000.0 / MAX(palabras, 1), 2) AS por_millon
+               FROM archivos
+               WHERE ejecucion_id = ? AND menciones > 0
+               ORDER BY menciones DESC
+               LIMIT ?""",
+            (ejecucion_id, limite)
+        )]
+
+    def frecuencia_por_carpeta(self, palabras):
+        """
+        Compara varias palabras por carpeta usando la ejecución más reciente de cada una
+
+        Args:
+            palabras (list): Palabras a comparar
+
+        Returns:
+            list: dicts con carpeta, palabra, archivos, palabras_carpeta, menciones y por_millon
+        """
+        filas = []
+        for palabra in palabras:
+            ejecucion_id = self.ultima_ejecucion(palabra)
+            if ejecucion_id is None:
+                continue
+            for fila in self.conexion.execute(
+                """SELECT carpeta, COUNT(*) AS archivos, SUM(palabras) AS palabras_carpeta,
+                          SUM(menciones) AS menciones,
+                          ROUND(SUM(menciones) * 1000000.0 / MAX(SUM(palabras), 1), 2) AS por_millon
+                   FROM archivos
+                   WHERE ejecucion_id = ?
+                   GROUP BY carpeta""",
+                (ejecucion_id,)
+            ):
+                filas.append({'palabra': palabra, **dict(fila)})
+        filas.sort(key=lambda f: (f['carpeta'], f['palabra']))
+        return filas
+
+    def cargar_resultados(self, ejecucion_id):
+        """
+        Reconstruye el diccionario de resultados de una ejecución
+
+        Args:
+            ejecucion_id (int): Identificador de la ejecución
+
+        Returns:
+            dict: Misma estructura que BuscadorPalabrasClave.resultados
+
+        Raises:
+            KeyError: Si la ejecución no existe
+        """
+        fila = self.conexion.execute(
+            "SELECT datos_json FROM ejecuciones WHERE id = ?", (ejecucion_id,)
+        ).fetchone()
+        if fila is None:
+            raise KeyError(f"No existe la ejecución {ejecucion_id}")
+        resultados = json.loads(fila['datos_json'])
+
+        contextos = {}
+        for c in self.conexion.execute(
+            """SELECT orden_archivo, texto, posicion, palabra FROM contextos
+               WHERE ejecucion_id = ? ORDER BY orden_archivo, orden""",
+            (ejecucion_id,)
+        ):
+            contextos.setdefault(c['orden_archivo'], []).append(
+                {'texto': c['texto'], 'posicion': c['posicion'], 'palabra': c['palabra']}
+            )
+
+        archivos = []
+        for a in self.conexion.execute(
+            """SELECT orden, ruta, archivo, palabras, menciones, grupos_json FROM archivos
+               WHERE ejecucion_id = ? ORDER BY orden""",
+            (ejecucion_id,)
+        ):
+            archivo = {
+                'archivo': a['archivo'],
+                'ruta': a['ruta'],
+                'palabras': a['palabras'],
+                'tiene_palabra_clave': a['menciones'] > 0,
+                'total_menciones': a['menciones'],
+                'contextos': contextos.get(a['orden'], [])
+            }
+            if a['grupos_json'] is not None:
+                archivo['grupos'] = json.loads(a['grupos_json'])
+            archivos.append(archivo)
+
+        resultados['archivos'] = archivos
+        return resultados
+
+
+def consultar_almacen(ruta_db, consulta, palabras, ejecucion_id=None, limite=10):
+    """
+    Responde consultas sobre el histórico sin volver a analizar el corpus
+
+    Args:
+        ruta_db (str): Base de datos SQLite
+        consulta (str): 'ejecuciones', 'top', 'carpetas' o 'html'
+        palabras (list): Palabras de la consulta
+        ejecucion_id (int): Ejecución para 'html' (la más reciente de la palabra si None)
+        limite (int): Número de filas para 'top'
+    """
+    almacen = AlmacenResultados(ruta_db)
+    try:
+        if consulta == 'ejecuciones':
+            for e in almacen.ejecuciones():
+                print(f"#{e['id']:<5} {e['fecha'][:19]}  \"{e['palabra']}\"  "
+                      f"{e['total_menciones']} menciones en {e['total_archivos']} archivos  ({e['directorio']})")
+
+        elif consulta == 'top':
+            for palabra in palabras:
+                print(f"\n🔝 Archivos con más menciones de \"{palabra}\":")
+                for i, f in enumerate(almacen.top_archivos(palabra, limite), 1):
+                    print(f"  {i:>3}. {f['menciones']:>6} menciones ({f['por_millon']} por millón)  {f['ruta']}")
+
+        elif consulta == 'carpetas':
+            print(f"{'Carpeta':<40} {'Palabra':<20} {'Menciones':>10} {'Por millón':>12}")
+            for f in almacen.frecuencia_por_carpeta(palabras):
+                print(f"{f['carpeta'][:40]:<40} {f['palabra'][:20]:<20} "
+                      f"{f['menciones']:>10} {f['por_millon']:>12}")
+
+        elif consulta == 'html':
+            if ejecucion_id is None:
+                ejecucion_id = almacen.ultima_ejecucion(palabras[0]) if palabras else None
+            if ejecucion_id is None:
+                print("❌ Indica --ejecucion o una --palabra con ejecuciones guardadas")
+                sys.exit(1)
+            resultados = almacen.cargar_resultados(ejecucion_id)
+            meta = resultados['metadata']
+            buscador = BuscadorPalabrasClave(meta['directorio'], meta['palabra_buscada'], motor='re')
+            buscador.resultados = resultados
+            buscador.generar_web_interactiva('resultados_busqueda.html')
+    finally:
+        almacen.cerrar()
+
+
 # ==========================================================================
 # FUNCIÓN PRINCIPAL
 # ==========================================================================
@@ -814,19 +3101,51 @@ def main():
 
     Uso:
         python3 buscador_palabras_clave.py /ruta/a/tus/archivos/txt
+        python3 buscador_palabras_clave.py /ruta/a/tus/archivos/txt --vigilar
+        python3 buscador_palabras_clave.py --bd historico.db --consultar top --palabra Falla
     """
+    parser = argparse.ArgumentParser(
+        description="Busca una palabra clave en un corpus de archivos TXT"
+    )
+    parser.add_argument('directorio', nargs='?',
+                        help="Directorio con los archivos TXT")
+    parser.add_argument('--vigilar', action='store_true',
+                        help="Mantener los resultados actualizados mientras llegan archivos")
+    parser.add_argument('--intervalo-sondeo', type=float, default=INTERVALO_SONDEO,
+                        help="Segundos entre comprobaciones en modo vigilancia")
+    parser.add_argument('--intervalo-escritura', type=float, default=INTERVALO_ESCRITURA,
+                        help="Segundos mínimos entre reescrituras del JSON/HTML")
+    parser.add_argument('--bd', default=BASE_DATOS_RESULTADOS,
+                        help="Base de datos SQLite donde guardar/consultar el histórico")
+    parser.add_argument('--consultar', choices=['ejecuciones', 'top', 'carpetas', 'html'],
+                        help="Consultar el histórico en lugar de analizar un directorio")
+    parser.add_argument('--palabra', action='append', default=[],
+                        help="Palabra para --consultar (se puede repetir para comparar)")
+    parser.add_argument('--ejecucion', type=int,
+                        help="Ejecución concreta para --consultar html")
+    parser.add_argument('--limite', type=int, default=10,
+                        help="Número de archivos para --consultar top")
+    args = parser.parse_args()
+
+    if args.consultar:
+        if not args.bd:
+            print("❌ ERROR: Indica la base de datos con --bd")
+            sys.exit(1)
+        consultar_almacen(args.bd, args.consultar, args.palabra, args.ejecucion, args.limite)
+        return
+
     # Verificar argumentos de línea de comandos
-    if len(sys.argv) < 2:
+    if args.directorio is None:
         print("❌ ERROR: Debes especificar la ruta al directorio con archivos TXT")
         print("\nUso:")
         print("  python3 buscador_palabras_clave.py /ruta/a/tus/archivos/txt")
         print("\nEjemplo:")
         print("  python3 buscador_palabras_clave.py ~/Desktop/MisRevistas")
         print("\n⚠️  IMPORTANTE: No olvides modificar la palabra clave en el archivo")
-        print("   Edita la línea 31 del script para cambiar la palabra a buscar")
+        print("   Edita la línea PALABRA_CLAVE = ... del script para cambiar la palabra a buscar")
         sys.exit(1)
 
-    directorio_base = sys.argv[1]
+    directorio_base = args.directorio
 
     # Verificar que el directorio existe
     if not os.path.exists(directorio_base):
@@ -843,15 +3162,51 @@ def main():
     print(f"🔎 Palabra clave: \"{PALABRA_CLAVE}\" (búsqueda de palabra completa, no sensible a mayúsculas)\n")
 
     # Inicializar buscador
-    buscador = BuscadorPalabrasClave(directorio_base, PALABRA_CLAVE)
+    agrupador = AgrupadorArchivos(AGRUPAR_POR_NIVELES, AGRUPAR_POR_PATRONES, ARCHIVO_METADATOS_CSV)
+    deduplicador = None
+    if DEDUPLICAR:
+        deduplicador = DetectorDuplicados(casi_duplicados=DETECTAR_CASI_DUPLICADOS,
+                                          umbral=UMBRAL_CASI_DUPLICADOS,
+                                          archivo_cache=ARCHIVO_CACHE_HUELLAS)
+    buscador = BuscadorPalabrasClave(directorio_base, PALABRA_CLAVE,
+                                     ventana_colocaciones=VENTANA_COLOCACIONES,
+                                     agrupador=agrupador or None,
+                                     deduplicador=deduplicador,
+                                     motor=MOTOR_BUSQUEDA,
+                                     distancia_maxima=DISTANCIA_MAXIMA_OCR,
+                                     archivo_indice=ARCHIVO_INDICE_VOCABULARIO,
+                                     tamaño_minimo_paralelo=(TAMAÑO_MINIMO_PARALELO_MB * 1024 * 1024
+                                                             if TAMAÑO_MINIMO_PARALELO_MB else None),
+                                     procesos=PROCESOS_PARALELOS)
+
+    if args.vigilar:
+        almacen = AlmacenResultados(args.bd) if args.bd else None
+        try:
+            buscador.vigilar(intervalo_sondeo=args.intervalo_sondeo,
+                             intervalo_escritura=args.intervalo_escritura,
+                             almacen=almacen)
+        finally:
+            if almacen is not None:
+                almacen.cerrar()
+        return
 
     # Ejecutar análisis
-    resultados = buscador.analizar_directorio()
+    try:
+        resultados = buscador.analizar_directorio()
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
     # Guardar resultados
     buscador.guardar_resultados('resultados_busqueda.json')
     buscador.generar_web_interactiva('resultados_busqueda.html')
 
+    if args.bd:
+        almacen = AlmacenResultados(args.bd)
+        ejecucion_id = almacen.guardar(resultados)
+        almacen.cerrar()
+        print(f"🗄️  Ejecución #{ejecucion_id} guardada en: {args.bd}")
+
     # Imprimir resumen
     print("\n" + "="*80)
     print("✅ ANÁLISIS COMPLETADO")
@@ -862,6 +3217,14 @@ def main():
     print(f"❌ Archivos sin '\"{PALABRA_CLAVE}\"': {resumen['archivos_sin_palabra']} ({resumen['porcentaje_sin_palabra']}%)")
     print(f"📊 Total menciones: {resumen['total_menciones']}")
     print(f"📈 Frecuencia: {resumen['frecuencia_por_millon_palabras']} menciones por millón de palabras")
+    if 'variantes' in resultados:
+        formas = [f"{v['forma']} ({v['menciones']})" for v in resultados['variantes']['formas'] if v['menciones']]
+        print(f"🔤 Variantes encontradas: {', '.join(formas) if formas else '—'}")
+    if 'duplicados' in resultados:
+        print(f"🧬 Duplicados omitidos: {resultados['metadata']['archivos_duplicados_omitidos']}")
+    if 'colocaciones' in resultados:
+        principales = [c['palabra'] for c in resultados['colocaciones']['colocados'][:5]]
+        print(f"🔗 Colocados principales: {', '.join(principales) if principales else '—'}")
     print(f"\n📁 Archivos generados:")
     print(f"   - resultados_busqueda.html (🌐 página web interactiva)")
     print(f"   - resultados_busqueda.json (datos completos)")
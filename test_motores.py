@@ -0,0 +1,70 @@
+"""
+Pruebas de los motores de búsqueda
+
+Todo motor de MOTORES debe devolver exactamente las mismas posiciones que
+MotorRe en los casos de CASOS_PRUEBA_MOTORES. Se ejecutan con:
+
+    python3 -m unittest test_motores
+"""
+
+import unittest
+
+from buscador_palabras_clave import MOTORES, MotorRe, casos_prueba_motores
+
+# Términos de prueba: simples, con letras que re.IGNORECASE iguala de forma
+# especial (s larga, i sin punto, sigma final, ligaduras) y varios a la vez
+TERMINOS = [
+    ['Falla'],
+    ['isla'],
+    ['casa'],
+    ['Iſabel'],
+    ['σοφός'],
+    ['ﬁn'],
+    ['é'],
+    ['Falla', 'Fal1a', 'Failla'],
+    ['de Falla'],
+]
+
+# Textos adicionales, fijos para todos los términos
+TEXTOS_EXTRA = [
+    '',
+    'ſ s ı i σ ς ﬁ fi',
+    'ISABEL iſabel ıSABEL İSABEL Isabel',
+    'CASA caſa Caſa',
+    'ΣΟΦΟΣ σοφόσ σοφός',
+    'FIN ﬁn Fin',
+    'Fallá é É é ẍ',
+    'de Falla, de  Falla, de\nFalla, DE FALLA',
+]
+
+
+class PruebaMotores(unittest.TestCase):
+    def comprobar_motor(self, nombre):
+        clase = MOTORES[nombre]
+        if not clase.disponible():
+            self.skipTest(f"Motor no disponible: {nombre}")
+        for terminos in TERMINOS:
+            referencia = MotorRe(terminos)
+            motor = clase(terminos)
+            textos = TEXTOS_EXTRA + [texto for t in terminos for texto in casos_prueba_motores(t)]
+            for texto in textos:
+                with self.subTest(terminos=terminos, texto=texto):
+                    self.assertEqual(motor.buscar(texto), referencia.buscar(texto))
+
+    def test_cadena(self):
+        self.comprobar_motor('cadena')
+
+    def test_regex(self):
+        self.comprobar_motor('regex')
+
+    def test_automata(self):
+        self.comprobar_motor('automata')
+
+    def test_todos_los_motores_tienen_prueba(self):
+        self.assertEqual(set(MOTORES) - {'re'},
+                         {nombre[len('test_'):] for nombre in dir(self)
+                          if nombre.startswith('test_') and nombre != 'test_todos_los_motores_tienen_prueba'})
+
+
+if __name__ == '__main__':
+    unittest.main()